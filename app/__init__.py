@@ -1,15 +1,23 @@
-import time
-from flask import Flask, g, request
-from flask_jwt_extended import get_jwt_identity
+from flask import Flask
 from dotenv import load_dotenv
 from app.config import Config
-from app.extensions import db, bcrypt, jwt, limiter
+from app.extensions import db, bcrypt, jwt, limiter, cache
 from flask_cors import CORS
 from flask_migrate import Migrate
-from flasgger import Swagger
 from app.utils.jwt_handlers import register_jwt_handlers
+from app.utils.token_blocklist import blocklist
+from app.utils.hashing import hashing_pool
 from app.utils.error_handlers import register_error_handlers
 from app.utils.logger import setup_logger
+from app.utils.json_provider import FastJSONProvider
+from app.utils.metrics import metrics
+from app.utils.query_stats import query_stats
+from app.utils.replicas import replicas
+from app.utils.health import health
+from app.services.like_buffer import like_buffer
+from app.services.trending import trending
+from app.commands import register_commands
+from app.swagger_config import init_docs
 import os
 from app.routes.auth_routes import auth_bp
 from app.routes.post_routes import post_bp
@@ -18,14 +26,16 @@ from app.routes.like_routes import like_bp
 from app.routes.user_routes import user_bp
 from app.routes.main_routes import main_bp
 from app.routes.health_routes import health_bp
+from app.routes.metrics_routes import metrics_bp
 
 logger = setup_logger()
 
-def create_app():
+def create_app(config_overrides=None):
     load_dotenv()
     logger.info("LOGGER INITIALIZED")
 
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     app.config.from_object(Config)
     app.logger.handlers = logger.handlers
     app.logger.setLevel(logger.level)
@@ -40,7 +50,7 @@ def create_app():
     env = os.getenv("FLASK_ENV", "development")
 
     if env == "production":
-        app.config.from_object("app.config.Productionconfig")
+        app.config.from_object("app.config.ProductionConfig")
     else:
         app.config.from_object("app.config.DevelopmentConfig")
         
@@ -48,30 +58,31 @@ def create_app():
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY")
+
+    #overrides for tests and benchmarks, applied before extensions read config
+    if config_overrides:
+        app.config.update(config_overrides)
     
     #extensions
+    replicas.init_app(app)
     db.init_app(app)
     bcrypt.init_app(app)
     jwt.init_app(app)
     limiter.init_app(app)
+    cache.init_app(app)
+    blocklist.init_app(app)
+    hashing_pool.init_app(app)
+    like_buffer.init_app(app)
+    trending.init_app(app)
 
-    @app.before_request
-    def start_timer():
-        print(">>> BEFORE REQUEST")
-        g.start_time = time.time()
-
-    @app.after_request
-    def log_request(response):
-        
-        print(">>> AFTER REQUEST")
-        print("METHOD:", request.method)
-        print("PATH:"< request.path)
+    #request counters, latency and size histograms, served on /metrics
+    metrics.init_app(app)
 
-        duration = round((time.time() - g.start_time) * 1000, 2)
-       
-        print("DURATION:", duration)
+    #background dependency prober behind /health
+    health.init_app(app)
 
-        return response
+    #per-request query counts, slow query log and N+1 warnings
+    query_stats.init_app(app)
     
     #register jwt handlers
     register_jwt_handlers(app)
@@ -79,6 +90,9 @@ def create_app():
     #register error handlers
     register_error_handlers(app)
 
+    #register cli commands
+    register_commands(app)
+
     migrate = Migrate(app, db)
     
     CORS(app, resources={r"/*": {"origins":"http://127.0.0.1:5500"}})
@@ -91,8 +105,10 @@ def create_app():
     app.register_blueprint(user_bp)
     app.register_blueprint(main_bp)
     app.register_blueprint(health_bp)
+    app.register_blueprint(metrics_bp)
     
-    Swagger(app)
+    #api docs, off in production unless SWAGGER_ENABLED=true
+    init_docs(app)
 
     return app
 
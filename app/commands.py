@@ -0,0 +1,199 @@
+import json
+import os
+import time
+import click
+from datetime import datetime
+from flask import current_app
+from app.extensions import db, cache
+from app.models import Post, Like, Comment, Counter, TokenBlockList, User
+from app.utils.sql import insert_ignoring_conflicts
+from app.services import import_service
+from app.services.trending import trending
+
+
+@click.group()
+def counters():
+    """Maintain denormalized counters."""
+
+
+# Recompute like_count/comment_count for every post in one UPDATE, then
+# users.post_count and the site-wide posts counter
+def recompute_counters():
+    likes = (
+        db.select(db.func.count(Like.id))
+        .where(Like.post_id == Post.id)
+        .scalar_subquery()
+    )
+    comments = (
+        db.select(db.func.count(Comment.id))
+        .where(Comment.post_id == Post.id)
+        .scalar_subquery()
+    )
+
+    result = db.session.execute(
+        db.update(Post).values(like_count=likes, comment_count=comments),
+        execution_options={"synchronize_session": False}
+    )
+
+    posts = (
+        db.select(db.func.count(Post.id))
+        .where(Post.author_id == User.id)
+        .scalar_subquery()
+    )
+    db.session.execute(
+        db.update(User).values(post_count=posts),
+        execution_options={"synchronize_session": False}
+    )
+
+    total = db.session.execute(db.select(db.func.count(Post.id))).scalar()
+    db.session.execute(insert_ignoring_conflicts(Counter).values(name="posts", value=total))
+    db.session.execute(db.update(Counter).where(Counter.name == "posts").values(value=total))
+    db.session.commit()
+    return result.rowcount
+
+
+@counters.command("reconcile")
+def reconcile_counters():
+    click.echo(f"Reconciled counters for {recompute_counters()} posts")
+
+
+@click.group()
+def blocklist():
+    """Maintain the revoked token table."""
+
+
+# Rows older than the access token lifetime can only match expired tokens,
+# which are rejected before the blocklist is consulted. Run from cron.
+@blocklist.command("purge")
+def purge_blocklist():
+    cutoff = datetime.utcnow() - current_app.config["JWT_ACCESS_TOKEN_EXPIRES"]
+
+    result = db.session.execute(
+        db.delete(TokenBlockList).where(TokenBlockList.created_at < cutoff)
+    )
+    db.session.commit()
+
+    click.echo(f"Purged {result.rowcount} revoked tokens")
+
+
+@click.group("import")
+def import_data():
+    """Bulk-load users, posts, comments and likes from NDJSON or CSV."""
+
+
+def _import_command(entity):
+    @import_data.command(entity, help=f"Load {entity} from PATH.")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--format", "fmt", type=click.Choice(["ndjson", "csv"]),
+                  help="Defaults to csv for .csv files, ndjson otherwise.")
+    @click.option("--batch-size", default=1000, show_default=True)
+    @click.option("--workers", default=os.cpu_count() or 1, show_default=True,
+                  help="Processes hashing passwords (users only, 0 = inline).")
+    @click.option("--no-copy", is_flag=True, help="Use INSERTs on Postgres too.")
+    @click.option("--no-reconcile", is_flag=True,
+                  help="Skip recomputing counters after posts, comments or likes.")
+    def command(path, fmt, batch_size, workers, no_copy, no_reconcile):
+        start = time.perf_counter()
+
+        def progress(result):
+            elapsed = time.perf_counter() - start
+            click.echo(
+                f"{entity}: {result.inserted} inserted, {result.skipped} skipped, "
+                f"{result.read / elapsed:.0f} rows/s"
+            )
+
+        result = import_service.import_entity(
+            entity,
+            import_service.read_records(path, fmt),
+            batch_size=batch_size,
+            workers=workers,
+            rounds=current_app.config["BCRYPT_LOG_ROUNDS"],
+            use_copy=False if no_copy else None,
+            on_batch=progress
+        )
+
+        import_service.sync_sequences(import_service.ENTITIES[entity][0])
+        if entity != "users" and not no_reconcile:
+            recompute_counters()
+        cache.invalidate("posts", "users")
+        if entity != "users":
+            trending.rebase()
+
+        for error in result.errors:
+            click.echo(f"skipped {error}", err=True)
+        if result.skipped > len(result.errors):
+            click.echo(f"... and {result.skipped - len(result.errors)} more", err=True)
+
+        elapsed = time.perf_counter() - start
+        click.echo(
+            f"Imported {result.inserted} of {result.read} {entity} in {elapsed:.1f}s "
+            f"({result.inserted / elapsed if elapsed else 0:.0f} rows/s)"
+        )
+
+    return command
+
+
+for _entity in ("users", "posts", "comments", "likes"):
+    _import_command(_entity)
+
+
+@click.group()
+def likes():
+    """Maintain write-behind likes."""
+
+
+# Applies buffered like/unlike intents now, e.g. before a deploy
+@likes.command("flush")
+def flush_likes():
+    from app.services.like_buffer import like_buffer
+
+    if not like_buffer.enabled:
+        raise click.ClickException("Write-behind likes are disabled (LIKE_BUFFER_ENABLED=false)")
+
+    click.echo(f"Flushed {like_buffer.flush()} like intents")
+
+
+@click.group("trending")
+def trending_group():
+    """Maintain the trending posts ranking."""
+
+
+# Rebuilds the ranking from the posts' counters now
+@trending_group.command("rebase")
+def rebase_trending():
+    count = trending.rebase()
+    if count is None:
+        raise click.ClickException("Another worker is rebasing the trending ranking")
+    click.echo(f"Rebased trending scores of {count} posts")
+
+
+@click.group()
+def docs():
+    """Build the OpenAPI spec ahead of time."""
+
+
+# Writes the spec once so deployments can serve it via SWAGGER_SPEC_FILE
+# instead of parsing every docstring on the first /apispec.json hit
+@docs.command("export")
+@click.argument("path", type=click.Path(dir_okay=False), default="apispec.json")
+def export_docs(path):
+    swagger = getattr(current_app, "swag", None)
+    if swagger is None:
+        raise click.ClickException("Docs are disabled (SWAGGER_ENABLED=false)")
+
+    with current_app.test_request_context():
+        spec = swagger.get_apispecs("apispec")
+
+    with open(path, "w") as f:
+        json.dump(spec, f, indent=2, default=str)
+
+    click.echo(f"Wrote {len(spec.get('paths', {}))} paths to {path}")
+
+
+def register_commands(app):
+    app.cli.add_command(counters)
+    app.cli.add_command(blocklist)
+    app.cli.add_command(import_data)
+    app.cli.add_command(likes)
+    app.cli.add_command(trending_group)
+    app.cli.add_command(docs)
@@ -2,7 +2,13 @@ import os
 from datetime import timedelta
 
 class Config:
-    RATELIMIT_STORAGE_URI = os.getenv("REDIS_URL")
+    # with Redis, limits are counted per worker and synced to Redis in
+    # batches (see app/utils/rate_limit_storage.py); set redis://... to make
+    # every hit a Redis round trip instead
+    RATELIMIT_STORAGE_URI = os.getenv(
+        "RATELIMIT_STORAGE_URI",
+        f"hybrid+{os.getenv('REDIS_URL')}" if os.getenv("REDIS_URL") else "memory://"
+    )
 
     JWT_SECRET_KEY = "super-secret-key-with-atleast-long-characters-like-ABCDE56789"
     
@@ -13,6 +19,14 @@ class Config:
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # comma separated read replica URIs; GET requests read from them, except
+    # for a user who wrote within READ_YOUR_WRITES_SECONDS
+    SQLALCHEMY_REPLICA_URIS = [
+        uri for uri in os.getenv("SQLALCHEMY_REPLICA_URIS", "").split(",") if uri
+    ]
+    READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+    REPLICA_PIN_REDIS_URL = os.getenv("REDIS_URL")
+
     SECRET_KEY = os.getenv("SECRET_KEY")
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 
@@ -23,9 +37,94 @@ class Config:
     JWT_BLACKLIST_ENABLED = True
     JWT_BLACKLIST_TOKEN_CHECKS = ["access"]
 
+    # where workers share revoked JTIs: "redis", "memory" (single worker only)
+    # or "database" (query token_block_list on every request)
+    JWT_BLOCKLIST_STORE = os.getenv(
+        "JWT_BLOCKLIST_STORE",
+        "redis" if os.getenv("REDIS_URL") else "database"
+    )
+    JWT_BLOCKLIST_REDIS_URL = os.getenv("REDIS_URL")
+    JWT_BLOCKLIST_SYNC_SECONDS = float(os.getenv("JWT_BLOCKLIST_SYNC_SECONDS", 1))
+
+    # with several gunicorn workers, point this at a directory they share
+    # (emptied on deploy) so /metrics adds up all of them
+    METRICS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 1))
+
+    # per-request SQL stats: Server-Timing header with query count and DB
+    # time, slow statement log, and N+1 warnings (on in development)
+    SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+    QUERY_SLOW_MS = float(os.getenv("QUERY_SLOW_MS", 250))
+    QUERY_N_PLUS_ONE_DETECTION = False
+    QUERY_N_PLUS_ONE_THRESHOLD = int(os.getenv("QUERY_N_PLUS_ONE_THRESHOLD", 3))
+
+    # /health answers from a background probe run every HEALTH_PROBE_INTERVAL
+    # seconds; Redis is probed only when REDIS_URL is set
+    HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", 5))
+    HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", 1))
+    HEALTH_MAX_AGE = float(os.getenv("HEALTH_MAX_AGE", 15))
+    HEALTH_REDIS_URL = os.getenv("REDIS_URL")
+
+    # Swagger UI on /docs/ and spec on /apispec.json; SWAGGER_SPEC_FILE is a
+    # spec written by `flask docs export`, served instead of building one
+    SWAGGER_ENABLED = os.getenv("SWAGGER_ENABLED", "true").lower() == "true"
+    SWAGGER_SPEC_FILE = os.getenv("SWAGGER_SPEC_FILE")
+
+    # write-behind likes: like/unlike record an intent in Redis (or process
+    # memory without REDIS_URL) and a flusher writes them in batches
+    LIKE_BUFFER_ENABLED = os.getenv("LIKE_BUFFER_ENABLED", "false").lower() == "true"
+    LIKE_BUFFER_REDIS_URL = os.getenv("REDIS_URL")
+    LIKE_BUFFER_FLUSH_INTERVAL = float(os.getenv("LIKE_BUFFER_FLUSH_INTERVAL", 1))
+    LIKE_BUFFER_BATCH_SIZE = int(os.getenv("LIKE_BUFFER_BATCH_SIZE", 500))
+
+    # totals of page-numbered listings: search counts are cached this long;
+    # on Postgres, optionally planner estimates for counts above the threshold
+    TOTALS_CACHE_TTL = int(os.getenv("TOTALS_CACHE_TTL", 30))
+    TOTALS_USE_ESTIMATES = os.getenv("TOTALS_USE_ESTIMATES", "false").lower() == "true"
+    TOTALS_ESTIMATE_THRESHOLD = int(os.getenv("TOTALS_ESTIMATE_THRESHOLD", 10000))
+
+    # GET /posts/trending: engagement halved every half-life of a post's
+    # age, scores kept in Redis (process memory without REDIS_URL) and
+    # rebuilt from the counters every rebase interval
+    TRENDING_REDIS_URL = os.getenv("REDIS_URL")
+    TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", 12))
+    TRENDING_WINDOW_HOURS = float(os.getenv("TRENDING_WINDOW_HOURS", 72))
+    TRENDING_REBASE_INTERVAL = float(os.getenv("TRENDING_REBASE_INTERVAL", 600))
+    TRENDING_LIKE_WEIGHT = float(os.getenv("TRENDING_LIKE_WEIGHT", 1))
+    TRENDING_COMMENT_WEIGHT = float(os.getenv("TRENDING_COMMENT_WEIGHT", 2))
+
+    # bcrypt cost; hashes with another cost are upgraded on the next login
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", 12))
+    # processes hashing passwords per app worker (0 = hash inline) and how
+    # many hashes may be in flight before logins get a 503
+    HASHING_POOL_WORKERS = int(os.getenv("HASHING_POOL_WORKERS", 2))
+    HASHING_POOL_MAX_PENDING = int(os.getenv("HASHING_POOL_MAX_PENDING", 8))
+    HASHING_POOL_TIMEOUT = float(os.getenv("HASHING_POOL_TIMEOUT", 10))
+
+    # hard cap on per_page for every paginated listing
+    MAX_PER_PAGE = int(os.getenv("MAX_PER_PAGE", 50))
+    FEED_EXCERPT_LENGTH = int(os.getenv("FEED_EXCERPT_LENGTH", 200))
+
+    # response cache: "memory" (per worker LRU), "redis" or "null"; shared
+    # in Redis whenever there is one, so invalidation reaches every worker
+    CACHE_TYPE = os.getenv(
+        "CACHE_TYPE",
+        "redis" if os.getenv("REDIS_URL") else "memory"
+    )
+    CACHE_REDIS_URL = os.getenv("REDIS_URL")
+    CACHE_DEFAULT_TIMEOUT = int(os.getenv("CACHE_DEFAULT_TIMEOUT", 60))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+    # single-flight on misses: lock across workers, how long an expired
+    # entry may still be served meanwhile, and early refresh (0 = off)
+    CACHE_LOCK_TIMEOUT = float(os.getenv("CACHE_LOCK_TIMEOUT", 5))
+    CACHE_STALE_TTL = int(os.getenv("CACHE_STALE_TTL", 30))
+    CACHE_EARLY_REFRESH_BETA = float(os.getenv("CACHE_EARLY_REFRESH_BETA", 1))
+
 class DevelopmentConfig(Config):
     DEBUG = False
+    QUERY_N_PLUS_ONE_DETECTION = True
 
 class ProductionConfig(Config):
     DEBUG = False
+    SWAGGER_ENABLED = os.getenv("SWAGGER_ENABLED", "false").lower() == "true"
 
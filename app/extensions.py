@@ -3,14 +3,17 @@ from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-import os
+from app.utils.cache import ResponseCache
+from app.utils.replicas import RoutingSession
+# registers the hybrid+redis:// storage scheme with limits
+from app.utils import rate_limit_storage
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 bcrypt = Bcrypt()
 jwt = JWTManager()
+cache = ResponseCache()
 
 limiter = Limiter(
     key_func=get_remote_address,
-    default_limits=["200 per day", "50 per hour"],
-    storage_uri=os.getenv("REDIS_URL", "memory://")
+    default_limits=["200 per day", "50 per hour"]
 )
\ No newline at end of file
@@ -10,11 +10,24 @@ class User(db.Model):
     password = db.Column(db.String(200), nullable=False)
     bio = db.Column(db.Text, nullable=True)
     profile_pic = db.Column(db.String(300), nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # denormalized like Post.like_count; the total of the my-posts listing
+    post_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     posts = db.relationship("Post", backref="author", lazy=True, foreign_keys="Post.author_id")
     comments = db.relationship("Comment", backref="author", lazy=True)
     likes = db.relationship("Like", backref="user", lazy=True)
 
+    @classmethod
+    def increment(cls, user_id, column, amount=1):
+        counter = getattr(cls, column)
+        db.session.execute(
+            db.update(cls)
+            .where(cls.id == user_id)
+            .values({counter: counter + amount})
+        )
+
 
 class Post(db.Model):
     __tablename__ = "posts"
@@ -28,13 +41,37 @@ class Post(db.Model):
     likes = db.relationship("Like", backref="post", lazy=True)
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # bumped by every UPDATE, including the counter updates; used for ETags
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # denormalized counters, only ever changed with atomic UPDATEs
+    # (see Post.increment) and recomputed by `flask counters reconcile`
+    like_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    # listings, the feed and my-posts page by (created_at, id)
+    __table_args__ = (
+        db.Index("ix_posts_created_at_id", "created_at", "id"),
+        db.Index("ix_posts_author_id_created_at_id", "author_id", "created_at", "id"),
+    )
+
+    @classmethod
+    def increment(cls, post_id, column, amount=1):
+        counter = getattr(cls, column)
+        db.session.execute(
+            db.update(cls)
+            .where(cls.id == post_id)
+            .values({counter: counter + amount})
+        )
 
     def to_dict(self):
         return {
             "id": self.id,
             "title": self.title,
             "content": self.content,
-            "author_id": self.author_id
+            "author_id": self.author_id,
+            "like_count": self.like_count,
+            "comment_count": self.comment_count
         }
 
 
@@ -47,12 +84,22 @@ class Comment(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     post_id = db.Column(db.Integer, db.ForeignKey("posts.id"), nullable=False)
 
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # comments of a post are paged by id
+    __table_args__ = (
+        db.Index("ix_comments_post_id_id", "post_id", "id"),
+        db.Index("ix_comments_user_id", "user_id"),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
             "text": self.text,
             "user_id": self.user_id,
-            "post_id": self.post_id
+            "post_id": self.post_id,
+            "created_at": self.created_at
         } 
 
 class Like(db.Model):
@@ -63,11 +110,29 @@ class Like(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     post_id = db.Column(db.Integer, db.ForeignKey("posts.id"), nullable=False)
 
-    #prevent duplicate likes
+    #prevent duplicate likes; it also serves lookups by user, the other
+    # index those by post (counts, reconcile)
     __table_args__ = (
         db.UniqueConstraint("user_id", "post_id", name="unique_user_post_like"),
+        db.Index("ix_likes_post_id", "post_id"),
     )
 
+# Site-wide counters kept with atomic UPDATEs, e.g. "posts" for the total
+# of the unfiltered listing. Recomputed by `flask counters reconcile`.
+class Counter(db.Model):
+    __tablename__ = "counters"
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    @classmethod
+    def increment(cls, name, amount=1):
+        db.session.execute(
+            db.update(cls)
+            .where(cls.name == name)
+            .values(value=cls.value + amount)
+        )
+
 class TokenBlockList(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     jti = db.Column(db.String(36), nullable=False, index=True)
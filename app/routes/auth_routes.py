@@ -7,9 +7,12 @@ from flask_jwt_extended import (
 )
 from flask import Blueprint, request, abort
 from app.models import User, TokenBlockList
-from app.extensions import db, bcrypt, limiter
+from app.extensions import db, limiter
 from datetime import datetime
 from app.utils.responses import error_response, success_response
+from app.utils.token_blocklist import blocklist
+from app.utils.hashing import hashing_pool
+from app.utils.sql import insert_ignoring_conflicts
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -28,27 +31,28 @@ def register():
     if not data.get("email"):
         return error_response("Email is required", 400)
      
-    existing_user = User.query.filter_by(username=data["username"]).first()
-    
-    if existing_user:
-        return error_response("Username already exists", 400)
-    
-    existing_mail = User.query.filter_by(email=data["email"]).first()
-
-    if existing_mail:
+    hashed_password = hashing_pool.generate_password_hash(data["password"])
+
+    # the unique constraints decide; a taken name or email inserts nothing
+    created = db.session.execute(
+        insert_ignoring_conflicts(User)
+        .values(
+            username=data["username"],
+            email=data["email"],
+            password=hashed_password
+        )
+        .returning(User.id)
+    ).scalar()
+
+    if created is None:
+        db.session.rollback()
+        username_taken = db.session.execute(
+            db.select(User.id).where(User.username == data["username"])
+        ).first()
+        if username_taken:
+            return error_response("Username already exists", 400)
         return error_response("Email already exists", 400)
 
-    hashed_password = bcrypt.generate_password_hash(
-        data["password"]
-    ).decode("utf-8")
-
-    new_user = User(
-        username=data["username"],
-        email=data["email"],
-        password=hashed_password
-    )
-
-    db.session.add(new_user)
     db.session.commit()
     return success_response("User created", status_code=201)
 
@@ -68,9 +72,14 @@ def login():
 
     user = User.query.filter_by(username=data["username"]).first()
 
-    if not user or not bcrypt.check_password_hash(user.password, data["password"]):
+    if not user or not hashing_pool.check_password_hash(user.password, data["password"]):
         return error_response("Invalid username or password", 401)
 
+    # upgrade hashes made with a different BCRYPT_LOG_ROUNDS
+    if hashing_pool.needs_rehash(user.password):
+        user.password = hashing_pool.generate_password_hash(data["password"])
+        db.session.commit()
+
     access_token = create_access_token(identity=str(user.id))
     refresh_token = create_refresh_token(identity=str(user.id))
 
@@ -97,6 +106,7 @@ def logout():
 
     db.session.add(revoked_token)
     db.session.commit()
+    blocklist.revoke(jti, jwt_data["exp"])
 
     return success_response(message="Successfully logged out")
 
@@ -151,10 +161,10 @@ def change_password():
     if not user:
         abort(404)
 
-    if not bcrypt.check_password_hash(user.password, old_password):
+    if not hashing_pool.check_password_hash(user.password, old_password):
         return error_response("Old password is incorrect", 401)
 
-    new_hash = bcrypt.generate_password_hash(new_password).decode("utf-8")
+    new_hash = hashing_pool.generate_password_hash(new_password)
     user.password = new_hash
 
     db.session.commit()
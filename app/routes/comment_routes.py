@@ -1,7 +1,11 @@
-from flask import Blueprint, request, abort
+from flask import Blueprint, request, abort, current_app, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import Comment, Post
-from app.extensions import db
+from app.extensions import db, cache
+from app.services.post_service import invalidate_post_cache
+from app.services.trending import trending
+from app.utils.etag import etag_from_body
+from app.utils.pagination import clamp_per_page, keyset_page_by_id, decode_id_cursor
 from app.utils.responses import error_response, success_response
 
 comment_bp = Blueprint("comments", __name__)
@@ -32,7 +36,10 @@ def add_comment(post_id):
     )
 
     db.session.add(new_comment)
+    Post.increment(post_id, "comment_count")
     db.session.commit()
+    invalidate_post_cache(post_id, comments=True)
+    trending.record(post_id, comments=1)
 
     return success_response(
         message="Comment added successfully",
@@ -42,18 +49,59 @@ def add_comment(post_id):
 
 # GET COMMENTS FOR POST
 @comment_bp.route("/posts/<int:post_id>/comments", methods=["GET"])
+@etag_from_body
+@cache.cached(tags=lambda post_id: [f"comments:{post_id}"])
 def get_comments(post_id):
     post = db.session.get(Post, post_id)
     if not post:
         abort(404)
 
-    comments = Comment.query.filter_by(post_id=post_id).all()
-
-    return success_response({
+    per_page = clamp_per_page(request.args.get("per_page", 20, type=int))
+    cursor = request.args.get("cursor", "", type=str)
+
+    if request.args.get("format") == "ndjson":
+        try:
+            after_id = decode_id_cursor(cursor) if cursor else 0
+        except ValueError:
+            return error_response("Invalid cursor", 400)
+        return stream_comments(post_id, after_id)
+
+    try:
+        comments, next_cursor = keyset_page_by_id(
+            Comment.query.filter_by(post_id=post_id),
+            Comment.id,
+            cursor,
+            per_page
+        )
+    except ValueError:
+        return error_response("Invalid cursor", 400)
+
+    return success_response(data={
         "items": [comment.to_dict() for comment in comments],
-        "total": len(comments)
+        "total": post.comment_count,
+        "next_cursor": next_cursor,
+        "has_next": next_cursor is not None
     })
 
+# All comments of a post as NDJSON, one object per line. Rows are fetched in
+# batches with yield_per, so memory stays flat however many comments there are.
+def stream_comments(post_id, after_id):
+    query = (
+        Comment.query
+        .filter(Comment.post_id == post_id, Comment.id > after_id)
+        .order_by(Comment.id.asc())
+        .yield_per(500)
+    )
+
+    def generate():
+        for comment in query:
+            yield current_app.json.dumps(comment.to_dict()) + "\n"
+
+    return current_app.response_class(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson"
+    )
+
 # UPDATE COMMENT
 @comment_bp.route("/comments/<int:comment_id>", methods=["PUT"])
 @jwt_required()
@@ -77,6 +125,7 @@ def update_comment(comment_id):
 
     comment.text = text
     db.session.commit()
+    cache.invalidate(f"comments:{comment.post_id}")
 
     return success_response(
         data=comment.to_dict(),
@@ -96,8 +145,23 @@ def delete_comment(comment_id):
     if comment.user_id != user_id:
         abort(403)
 
-    db.session.delete(comment)
+    post_id = comment.post_id
+
+    # only the request that really removed the row moves the counter
+    deleted = db.session.execute(
+        db.delete(Comment)
+        .where(Comment.id == comment_id)
+        .returning(Comment.id)
+    ).scalar()
+
+    if deleted is None:
+        db.session.rollback()
+        abort(404)
+
+    Post.increment(post_id, "comment_count", -1)
     db.session.commit()
+    invalidate_post_cache(post_id, comments=True)
+    trending.record(post_id, comments=-1)
 
     return success_response(
         message="Comment deleted successfully"
@@ -1,35 +1,30 @@
 from flask import Blueprint, jsonify
-from app.extensions import db
-from sqlalchemy import text
-import redis
-import os
+from app.extensions import limiter
+from app.utils.health import health
 
 health_bp = Blueprint("health", __name__)
 
+# HEALTH (last probe result, never blocks on a dependency)
 @health_bp.route("/health", methods=["GET"])
+@limiter.exempt
 def health_check():
-    status={
-        "api": "ok",
-        "database": "unknown",
-        "redis": "unknown"
-    }
+    return jsonify(health.current())
 
-    try:
-        db.session.execute(text("SELECT 1"))
-        status["database"] = "ok"
-    except Exception:
-        status["database"] = "error"
+# LIVENESS (the process serves requests)
+@health_bp.route("/health/live", methods=["GET"])
+@limiter.exempt
+def liveness():
+    return jsonify({"status": "alive"})
 
-    try:
-        r = redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379"))
-        r.ping()
-        status["redis"] = "ok"
-    except Exception:
-        status["redis"] = "error"
-
-    overall = "healthy" if all(v == "ok" for v in status.values()) else "degraded"
+# READINESS (primary database reachable, probe result fresh)
+@health_bp.route("/health/ready", methods=["GET"])
+@limiter.exempt
+def readiness():
+    report = health.current()
+    ready = health.is_ready(report)
 
     return jsonify({
-        "status": overall,
-        "services": status
-    })
+        "status": "ready" if ready else "unavailable",
+        "services": report["services"],
+        "age_seconds": report["age_seconds"]
+    }), 200 if ready else 503
@@ -1,33 +1,73 @@
-from flask import Blueprint, abort
+from flask import Blueprint, abort, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import Like, Post
-from app.extensions import db
+from app.extensions import db, cache
 from app.utils.responses import error_response, success_response
+from app.services.post_service import invalidate_post_cache
+from app.services.like_buffer import like_buffer
+from app.services.trending import trending
+from app.utils.sql import insert_ignoring_conflicts
 
 like_bp = Blueprint("likes", __name__)
 
 
+# Whether the post exists and the user's like row exists, in one query
+def _post_and_like(user_id, post_id):
+    return db.session.execute(
+        db.select(Post.id, Like.id.isnot(None))
+        .outerjoin(Like, (Like.post_id == Post.id) & (Like.user_id == user_id))
+        .where(Post.id == post_id)
+    ).first()
+
+# Write-behind like/unlike: record the intent, the flusher writes the row
+def _buffer_like(user_id, post_id, liked):
+    row = _post_and_like(user_id, post_id)
+    if row is None:
+        abort(404)
+
+    if not like_buffer.record(user_id, post_id, liked, row[1]):
+        if liked:
+            return error_response("Post already liked", 400)
+        abort(404)
+
+    # cached posts and counts include pending intents
+    invalidate_post_cache(post_id)
+    cache.invalidate(f"likes:{post_id}")
+
+    return success_response(
+        message="Post liked" if liked else "Post unliked",
+        status_code=202
+    )
+
 #LIKE POST
 @like_bp.route("/posts/<int:post_id>/like", methods=["POST"])
 @jwt_required()
 def like_post(post_id):
     user_id = int(get_jwt_identity())
 
-    post = db.session.get(Post, post_id)
-    if not post:
-        abort(404)
-
-    existing_like = Like.query.filter_by(
-        user_id=user_id,
-        post_id=post_id
-    ).first()
-
-    if existing_like:
+    if like_buffer.enabled:
+        return _buffer_like(user_id, post_id, True)
+
+    # one statement: inserts only if the post exists and isn't liked yet
+    inserted = db.session.execute(
+        insert_ignoring_conflicts(Like, ["user_id", "post_id"])
+        .from_select(
+            ["user_id", "post_id"],
+            db.select(db.literal(user_id), Post.id).where(Post.id == post_id)
+        )
+        .returning(Like.id)
+    ).scalar()
+
+    if inserted is None:
+        db.session.rollback()
+        if db.session.get(Post, post_id) is None:
+            abort(404)
         return error_response("Post already liked", 400)
 
-    new_like = Like(user_id=user_id, post_id=post_id)
-    db.session.add(new_like)
+    Post.increment(post_id, "like_count")
     db.session.commit()
+    invalidate_post_cache(post_id)
+    trending.record(post_id, likes=1)
 
     return success_response(
         message="Post liked",
@@ -40,16 +80,24 @@ def like_post(post_id):
 def unlike_post(post_id):
     user_id = int(get_jwt_identity())
 
-    like = Like.query.filter_by(
-        user_id=user_id,
-        post_id=post_id
-    ).first()
+    if like_buffer.enabled:
+        return _buffer_like(user_id, post_id, False)
 
-    if not like:
+    # one statement; only the request that really removed the row counts
+    deleted = db.session.execute(
+        db.delete(Like)
+        .where(Like.user_id == user_id, Like.post_id == post_id)
+        .returning(Like.id)
+    ).scalar()
+
+    if deleted is None:
+        db.session.rollback()
         abort(404)
 
-    db.session.delete(like)
+    Post.increment(post_id, "like_count", -1)
     db.session.commit()
+    invalidate_post_cache(post_id)
+    trending.record(post_id, likes=-1)
 
     return success_response(
         message="Post unliked"
@@ -58,12 +106,17 @@ def unlike_post(post_id):
 
 # GET LIKES COUNT
 @like_bp.route("/posts/<int:post_id>/likes-count", methods=["GET"])
+@cache.cached(tags=lambda post_id: [f"post:{post_id}", f"likes:{post_id}"])
 def get_likes_count(post_id):
-    post = db.session.get(Post, post_id)
-    if not post:
+    likes_count = db.session.execute(
+        db.select(Post.like_count).where(Post.id == post_id)
+    ).scalar()
+
+    if likes_count is None:
         abort(404)
 
-    likes_count = Like.query.filter_by(post_id=post_id).count()
+    if like_buffer.enabled:
+        likes_count += like_buffer.count_deltas([post_id])[post_id]
 
     return success_response(
         message="Likes fetched",
@@ -71,4 +124,58 @@ def get_likes_count(post_id):
             "post_id": post_id,
             "likes": likes_count
         }
+    )
+
+# LIKE STATUS FOR MANY POSTS
+@like_bp.route("/likes/status", methods=["POST"])
+@jwt_required(optional=True)
+def get_likes_status():
+    data = request.get_json(silent=True)
+
+    if data is None:
+        return error_response("Request body must be JSON", 400)
+
+    post_ids = data.get("post_ids")
+    max_ids = current_app.config["MAX_PER_PAGE"]
+
+    if not isinstance(post_ids, list) or not all(isinstance(i, int) for i in post_ids):
+        return error_response("post_ids must be a list of integers", 400)
+    if len(post_ids) > max_ids:
+        return error_response(f"At most {max_ids} post_ids per request", 400)
+
+    identity = get_jwt_identity()
+
+    # counts and the caller's like in one query
+    if identity is None:
+        query = db.select(Post.id, Post.like_count, db.false())
+    else:
+        query = db.select(Post.id, Post.like_count, Like.id.isnot(None)).outerjoin(
+            Like,
+            (Like.post_id == Post.id) & (Like.user_id == int(identity))
+        )
+
+    rows = db.session.execute(query.where(Post.id.in_(post_ids))).all()
+    status = {post_id: (likes, bool(liked)) for post_id, likes, liked in rows}
+
+    # pending write-behind intents on top of the table
+    if like_buffer.enabled and status:
+        deltas = like_buffer.count_deltas(list(status))
+        pending = like_buffer.liked_states(int(identity), list(status)) if identity else {}
+        status = {
+            post_id: (likes + deltas[post_id], pending.get(post_id, liked))
+            for post_id, (likes, liked) in status.items()
+        }
+
+    return success_response(
+        message="Like status fetched",
+        data={
+            "items": [
+                {
+                    "post_id": post_id,
+                    "likes": status[post_id][0],
+                    "liked": status[post_id][1]
+                }
+                for post_id in dict.fromkeys(post_ids) if post_id in status
+            ]
+        }
     )
\ No newline at end of file
@@ -0,0 +1,13 @@
+from flask import Blueprint
+from app.extensions import limiter
+from app.utils.metrics import metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+# PROMETHEUS SCRAPE ENDPOINT
+@metrics_bp.route("/metrics", methods=["GET"])
+@limiter.exempt
+def get_metrics():
+    return metrics.collect(), 200, {
+        "Content-Type": "text/plain; version=0.0.4; charset=utf-8"
+    }
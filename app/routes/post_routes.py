@@ -1,47 +1,180 @@
-from flask import Blueprint, request, abort
+from flask import Blueprint, request, abort, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import Post, db
-from app.extensions import db
-from app.utils.responses import success_response, error_response
-from app.services import post_service
+from app.extensions import db, cache
+from app.utils.responses import success_response, error_response, rows_response
+from app.utils.pagination import clamp_per_page
+from app.utils.etag import etag_from_body, etag_from_version
+from app.services import post_service, search_service, totals
+from app.services.trending import trending
+from app.services.like_buffer import like_buffer
 
 post_bp = Blueprint("posts", __name__)
 
 # GET ALL POSTS (Pagination + Search)
 @post_bp.route("/posts", methods=["GET"])
+@etag_from_body
+@cache.cached(tags=["posts"])
 def get_posts():
     
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 5, type=int)
     search = request.args.get("search", "", type=str)
     sort = request.args.get("sort", "new", type=str)
+
+    # multi-get: ?ids=1,2,3
+    if "ids" in request.args:
+        try:
+            ids = [int(i) for i in request.args["ids"].split(",") if i.strip()]
+        except ValueError:
+            return error_response("ids must be a comma separated list of integers", 400)
+
+        if len(ids) > current_app.config["MAX_PER_PAGE"]:
+            return error_response(
+                f"At most {current_app.config['MAX_PER_PAGE']} ids per request", 400
+            )
+
+        posts = post_service.get_posts_by_ids(list(dict.fromkeys(ids)))
+        return success_response(
+            message="Posts fetched",
+            data={"items": like_buffer.with_pending_counts([post.to_dict() for post in posts])}
+        )
+
+    # cursor mode: ?cursor= for the first page, then ?cursor=<next_cursor>
+    if "cursor" in request.args:
+        try:
+            posts, next_cursor = post_service.get_posts_by_cursor(
+                request.args.get("cursor", "", type=str),
+                clamp_per_page(per_page),
+                search,
+                sort
+            )
+        except ValueError:
+            return error_response("Invalid cursor", 400)
+
+        return success_response(
+            message="Posts fetched",
+            data={
+                "items": like_buffer.with_pending_counts([post.to_dict() for post in posts]),
+                "next_cursor": next_cursor,
+                "has_next": next_cursor is not None
+            }
+        )
     
     query = Post.query
 
-    if search: #searching
-        query = query.filter(Post.title.ilike(f"%{search}%"))
+    if search: #searching, ranked by relevance
+        query = search_service.search_posts(query, search)
 
     if sort == "old":
         query = query.order_by(Post.id.asc())
     else:
         query = query.order_by(Post.created_at.desc())
 
+    # the total comes from the totals service, not a COUNT per request
     pagination = query.paginate(
         page=page,
         per_page=per_page,
-        error_out=False
+        max_per_page=current_app.config["MAX_PER_PAGE"],
+        error_out=False,
+        count=False
     )
-    
-    posts = [post.to_dict() for post in pagination.items]
+
+    if search:
+        total, exact = totals.filtered_total(query, "posts", search)
+    else:
+        total, exact = totals.posts_total()
+
+    posts = like_buffer.with_pending_counts([post.to_dict() for post in pagination.items])
     return success_response(
         message="Posts fetched",
         data={
             "items": posts,
-            "total": pagination.total,
-            "pages": pagination.pages,
-            "current_page": pagination.page,
-            "has_next": pagination.has_next,
-            "has_prev": pagination.has_prev
+            **totals.page_fields(pagination, total, exact)
+        }
+    )
+
+# GET TRENDING POSTS (ranked by decayed engagement)
+@post_bp.route("/posts/trending", methods=["GET"])
+def get_trending_posts():
+    per_page = clamp_per_page(request.args.get("per_page", 10, type=int))
+
+    try:
+        ranked, next_cursor = trending.page(
+            request.args.get("cursor", "", type=str),
+            per_page
+        )
+    except ValueError:
+        return error_response("Invalid cursor", 400)
+
+    # deleted posts may linger in the ranking until the next rebase
+    posts = {post.id: post for post in post_service.get_posts_by_ids([i for i, _ in ranked])}
+
+    return success_response(
+        message="Trending posts fetched",
+        data={
+            "items": like_buffer.with_pending_counts([
+                {**posts[post_id].to_dict(), "score": round(score, 6)}
+                for post_id, score in ranked if post_id in posts
+            ]),
+            "next_cursor": next_cursor,
+            "has_next": next_cursor is not None
+        }
+    )
+
+# GET FEED (posts with author and counts)
+@post_bp.route("/feed", methods=["GET"])
+@etag_from_body
+@cache.cached(tags=["posts", "users"])
+def get_feed():
+    per_page = clamp_per_page(request.args.get("per_page", 10, type=int))
+
+    try:
+        rows, next_cursor = post_service.get_feed(
+            request.args.get("cursor", "", type=str),
+            per_page
+        )
+    except ValueError:
+        return error_response("Invalid cursor", 400)
+
+    # columnar format: one array per post instead of an object
+    if request.args.get("format") == "rows":
+        if like_buffer.enabled and rows:
+            deltas = like_buffer.count_deltas([row.id for row in rows])
+            at = post_service.FEED_COLUMNS.index("like_count")
+            rows = [
+                (*row[:at], row.like_count + deltas[row.id], *row[at + 1:]) for row in rows
+            ]
+        return rows_response(
+            rows,
+            post_service.FEED_COLUMNS,
+            message="Feed fetched",
+            extra={"next_cursor": next_cursor, "has_next": next_cursor is not None}
+        )
+
+    items = like_buffer.with_pending_counts([
+        {
+            "id": row.id,
+            "title": row.title,
+            "excerpt": row.excerpt,
+            "created_at": row.created_at,
+            "like_count": row.like_count,
+            "comment_count": row.comment_count,
+            "author": {
+                "id": row.author_id,
+                "username": row.username,
+                "profile_pic": row.profile_pic
+            }
+        }
+        for row in rows
+    ])
+
+    return success_response(
+        message="Feed fetched",
+        data={
+            "items": items,
+            "next_cursor": next_cursor,
+            "has_next": next_cursor is not None
         }
     )
 
@@ -49,20 +182,35 @@ def get_posts():
 @post_bp.route("/my-posts", methods=["GET"])
 @jwt_required()
 def get_my_posts():
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
 
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 5, type=int)
     search = request.args.get("search", "", type=str)
 
-    posts, pagination = post_service.get_my_posts(page, per_page, search, user_id)
+    if "cursor" in request.args:
+        try:
+            posts, next_cursor = post_service.get_my_posts_by_cursor(
+                request.args.get("cursor", "", type=str),
+                clamp_per_page(per_page),
+                search,
+                user_id
+            )
+        except ValueError:
+            return error_response("Invalid cursor", 400)
+
+        return success_response(data={
+            "items": like_buffer.with_pending_counts([post.to_dict() for post in posts]),
+            "next_cursor": next_cursor,
+            "has_next": next_cursor is not None
+        })
+
+    posts, page_fields = post_service.get_my_posts(page, per_page, search, user_id)
 
-    return success_response({
-        "items": [post.to_dict() for post in posts],
+    return success_response(data={
+        "items": like_buffer.with_pending_counts([post.to_dict() for post in posts]),
         "pagination": {
-            "total": pagination.total,
-            "pages": pagination.pages,
-            "current_page": pagination.page
+            key: page_fields[key] for key in ("total", "total_exact", "pages", "current_page")
         }
     })
 
@@ -141,6 +289,8 @@ def create_post():
 
 # GET SINGLE POST
 @post_bp.route("/posts/<int:post_id>", methods=["GET"])
+@etag_from_version(post_service.get_post_version)
+@cache.cached(tags=lambda post_id: [f"post:{post_id}"])
 def get_post(post_id):
     post = Post.query.get(post_id)
 
@@ -149,7 +299,7 @@ def get_post(post_id):
 
     return success_response(
         message="Post fetched",
-        data=post.to_dict()
+        data=like_buffer.with_pending_counts([post.to_dict()])[0]
     )
 
 # UPDATE POST
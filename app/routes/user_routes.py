@@ -2,10 +2,19 @@ from flask import Blueprint, request, abort
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import db, User
 from app.utils.responses import error_response, success_response
+from app.utils.etag import etag_from_version
+from app.extensions import cache
 
 user_bp = Blueprint("user_bp", __name__)
 
+# Version for the profile's ETag, without loading the row
+def get_user_version(user_id):
+    return db.session.execute(
+        db.select(User.updated_at).where(User.id == user_id)
+    ).scalar()
+
 @user_bp.route("/users/<int:user_id>", methods=["GET"])
+@etag_from_version(get_user_version)
 def get_user_profiel(user_id):
 
     user = db.session.get(User, user_id)
@@ -44,6 +53,7 @@ def update_profile():
         user.profile_pic = profile_pic
 
     db.session.commit()
+    cache.invalidate("users")
 
     return success_response({
         "message": "Profile updated",
@@ -0,0 +1,287 @@
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from sqlalchemy import exc
+from app.extensions import db
+from app.models import User, Post, Comment, Like
+from app.utils.hashing import hash_password
+
+
+class ImportRowError(ValueError):
+    pass
+
+
+def _int(value):
+    return int(value)
+
+
+def _datetime(value):
+    if isinstance(value, datetime):
+        return value
+    # fromisoformat in 3.11 accepts a trailing Z, but stored times are naive UTC
+    return datetime.fromisoformat(value).replace(tzinfo=None)
+
+
+def _str(value):
+    return str(value)
+
+
+# entity -> (model, required columns, optional columns); each column maps to
+# the function that converts the raw NDJSON/CSV value
+ENTITIES = {
+    "users": (
+        User,
+        {"username": _str, "email": _str},
+        {"id": _int, "password": _str, "password_hash": _str, "bio": _str, "profile_pic": _str},
+    ),
+    "posts": (
+        Post,
+        {"title": _str, "content": _str, "author_id": _int},
+        {"id": _int, "created_at": _datetime, "updated_at": _datetime},
+    ),
+    "comments": (
+        Comment,
+        {"text": _str, "user_id": _int, "post_id": _int},
+        {"id": _int, "created_at": _datetime, "updated_at": _datetime},
+    ),
+    "likes": (
+        Like,
+        {"user_id": _int, "post_id": _int},
+        {"id": _int},
+    ),
+}
+
+
+# Streams records from an NDJSON (.ndjson, .jsonl) or CSV file as
+# (line number, dict) pairs. Empty CSV cells count as missing.
+def read_records(path, fmt=None):
+    fmt = fmt or ("csv" if os.path.splitext(path)[1].lower() == ".csv" else "ndjson")
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            for line, record in enumerate(csv.DictReader(f), start=2):
+                yield line, {k: v for k, v in record.items() if v not in ("", None)}
+            return
+
+        for line, text in enumerate(f, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line, json.loads(text)
+            except ValueError as e:
+                yield line, ImportRowError(f"invalid JSON: {e}")
+
+
+def normalize(entity, record):
+    if isinstance(record, Exception):
+        raise record
+
+    if not isinstance(record, dict):
+        raise ImportRowError(f"expected an object, got {type(record).__name__}")
+
+    _, required, optional = ENTITIES[entity]
+    row = {}
+
+    for column, convert in required.items():
+        if record.get(column) in (None, ""):
+            raise ImportRowError(f"missing {column}")
+        row[column] = convert(record[column])
+
+    for column, convert in optional.items():
+        if record.get(column) not in (None, ""):
+            row[column] = convert(record[column])
+
+    if entity == "users" and "password" not in row and "password_hash" not in row:
+        raise ImportRowError("missing password or password_hash")
+
+    return row
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# Plaintext passwords are hashed in the given process pool, a few chunks per
+# worker; rows that already carry a bcrypt password_hash keep it
+def hash_passwords(rows, executor, workers, rounds):
+    plain = [row for row in rows if "password_hash" not in row]
+    passwords = [row.pop("password") for row in plain]
+
+    if executor is None:
+        hashes = [hash_password(password, rounds) for password in passwords]
+    else:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        hashes = executor.map(hash_password, passwords, [rounds] * len(passwords), chunksize=chunksize)
+
+    for row, hashed in zip(plain, hashes):
+        row["password"] = hashed
+
+    for row in rows:
+        if "password_hash" in row:
+            row.pop("password", None)
+            row["password"] = row.pop("password_hash")
+
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+# COPY ... FROM STDIN in text format through the session's psycopg2 connection
+def _copy_rows(table, columns, rows):
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(row[column]) for column in columns) + "\n")
+    buffer.seek(0)
+
+    dbapi_connection = db.session.connection().connection.dbapi_connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+# COPY skips the Python-side column defaults (created_at, counters), so they
+# are filled in here for both paths
+def _apply_defaults(table, row):
+    for column in table.columns:
+        default = column.default
+        if column.name in row or default is None:
+            continue
+        if default.is_callable:
+            row[column.name] = default.arg(None)
+        elif default.is_scalar:
+            row[column.name] = default.arg
+
+
+def _insert_rows(table, rows, use_copy):
+    # one statement per distinct set of columns: rows with and without ids
+    groups = {}
+    for row in rows:
+        _apply_defaults(table, row)
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    for columns, group in groups.items():
+        if use_copy:
+            _copy_rows(table, columns, group)
+        else:
+            db.session.execute(db.insert(table), group)
+
+
+def _integrity_errors():
+    dbapi = db.engine.dialect.dbapi
+    errors = (exc.IntegrityError, exc.DataError)
+    if dbapi is not None:
+        errors += (dbapi.IntegrityError, dbapi.DataError)
+    return errors
+
+
+class ImportResult:
+    def __init__(self):
+        self.read = 0
+        self.inserted = 0
+        self.skipped = 0
+        self.errors = []
+
+    def skip(self, line, message, keep=20):
+        self.skipped += 1
+        if len(self.errors) < keep:
+            self.errors.append(f"line {line}: {message}")
+
+
+# Loads one entity in batches of batch_size rows. Each batch is a single
+# executemany INSERT (COPY on Postgres) committed on its own. If the batch
+# violates a constraint it is rolled back and retried row by row under
+# savepoints, so only the offending rows are skipped.
+#
+# Passwords are hashed with `workers` processes (0 = inline) at bcrypt cost
+# `rounds`. on_batch(result) is called after every committed batch.
+def import_entity(entity, records, batch_size=1000, workers=0, rounds=12,
+                  use_copy=None, on_batch=None):
+    executor = None
+    if entity == "users" and workers:
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+    try:
+        return _import(entity, records, batch_size, executor, workers, rounds, use_copy, on_batch)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def _import(entity, records, batch_size, executor, workers, rounds, use_copy, on_batch):
+    model = ENTITIES[entity][0]
+    table = model.__table__
+    if use_copy is None:
+        use_copy = db.engine.dialect.name == "postgresql"
+
+    integrity_errors = _integrity_errors()
+    result = ImportResult()
+
+    for batch in batched(records, batch_size):
+        lines, rows = [], []
+
+        for line, record in batch:
+            result.read += 1
+            try:
+                rows.append(normalize(entity, record))
+                lines.append(line)
+            except (ImportRowError, ValueError, TypeError) as e:
+                result.skip(line, str(e))
+
+        if entity == "users":
+            hash_passwords(rows, executor, workers, rounds)
+
+        try:
+            _insert_rows(table, rows, use_copy)
+            db.session.commit()
+            result.inserted += len(rows)
+        except integrity_errors:
+            db.session.rollback()
+            _insert_one_by_one(table, lines, rows, result, integrity_errors)
+
+        if on_batch is not None:
+            on_batch(result)
+
+    return result
+
+
+def _insert_one_by_one(table, lines, rows, result, integrity_errors):
+    for line, row in zip(lines, rows):
+        savepoint = db.session.begin_nested()
+        try:
+            db.session.execute(db.insert(table), [row])
+            savepoint.commit()
+            result.inserted += 1
+        except integrity_errors as e:
+            savepoint.rollback()
+            result.skip(line, str(getattr(e, "orig", e)).splitlines()[0])
+
+    db.session.commit()
+
+
+# Imported ids leave Postgres sequences behind; move them past the new rows
+def sync_sequences(*models):
+    if db.engine.dialect.name != "postgresql":
+        return
+
+    for model in models:
+        table = model.__tablename__
+        db.session.execute(db.text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+        ))
+    db.session.commit()
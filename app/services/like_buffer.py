@@ -0,0 +1,339 @@
+import os
+import threading
+import time
+import redis
+from collections import Counter
+from app.extensions import db, cache
+from app.models import Like, Post
+from app.services.trending import trending
+from app.utils.logger import setup_logger
+from app.utils.sql import insert_ignoring_conflicts
+
+logger = setup_logger()
+
+LIKED, UNLIKED = "1", "0"
+
+
+def _field(user_id, post_id):
+    return f"{user_id}:{post_id}"
+
+
+def _parse_field(field):
+    user_id, post_id = field.split(":")
+    return int(user_id), int(post_id)
+
+
+# Records an intent atomically. The state it changes is the intent still
+# pending, else the one being flushed, else the row in the table (ARGV[3]).
+# Returns 0 when the user's like already is in the requested state.
+RECORD_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+local base = redis.call('HGET', KEYS[3], ARGV[1]) or ARGV[3]
+if not current then current = base end
+if current == ARGV[2] then return 0 end
+if ARGV[2] == base then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+else
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+end
+redis.call('HINCRBY', KEYS[2], ARGV[4], ARGV[2] == '1' and 1 or -1)
+return 1
+"""
+
+# Moves the pending intents aside for one flush. A flush that died halfway
+# left its batch in place; it is returned again and re-applied, which is
+# safe because applying a batch is idempotent.
+BEGIN_FLUSH_SCRIPT = """
+if redis.call('EXISTS', KEYS[3]) == 0 then
+    if redis.call('EXISTS', KEYS[1]) == 0 then return {} end
+    redis.call('RENAME', KEYS[1], KEYS[3])
+    if redis.call('EXISTS', KEYS[2]) == 1 then redis.call('RENAME', KEYS[2], KEYS[4]) end
+end
+return redis.call('HGETALL', KEYS[3])
+"""
+
+
+class RedisLikeStore:
+    pending = "likes:pending"
+    delta = "likes:delta"
+    flushing = "likes:flushing"
+    flushing_delta = "likes:flushing:delta"
+    lock = "likes:flush-lock"
+
+    def __init__(self, url):
+        self._client = redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._record = self._client.register_script(RECORD_SCRIPT)
+        self._begin = self._client.register_script(BEGIN_FLUSH_SCRIPT)
+
+    def record(self, user_id, post_id, state, db_state):
+        return bool(self._record(
+            keys=[self.pending, self.delta, self.flushing],
+            args=[_field(user_id, post_id), state, db_state, post_id]
+        ))
+
+    def states(self, user_id, post_ids):
+        fields = [_field(user_id, post_id) for post_id in post_ids]
+        pipe = self._client.pipeline()
+        pipe.hmget(self.pending, fields)
+        pipe.hmget(self.flushing, fields)
+        pending, flushing = pipe.execute()
+        return {
+            post_id: (p or f).decode()
+            for post_id, p, f in zip(post_ids, pending, flushing) if (p or f) is not None
+        }
+
+    def deltas(self, post_ids):
+        fields = [str(post_id) for post_id in post_ids]
+        pipe = self._client.pipeline()
+        pipe.hmget(self.delta, fields)
+        pipe.hmget(self.flushing_delta, fields)
+        live, flushing = pipe.execute()
+        return {
+            post_id: int(a or 0) + int(b or 0)
+            for post_id, a, b in zip(post_ids, live, flushing)
+        }
+
+    def begin_flush(self, timeout):
+        if not self._client.set(self.lock, os.getpid(), nx=True, px=int(timeout * 1000)):
+            return None
+        raw = self._begin(keys=[self.pending, self.delta, self.flushing, self.flushing_delta])
+        return {raw[i].decode(): raw[i + 1].decode() for i in range(0, len(raw), 2)}
+
+    def end_flush(self):
+        self._client.delete(self.flushing, self.flushing_delta, self.lock)
+
+    def abort_flush(self):
+        self._client.delete(self.lock)
+
+
+# Process-local stand-in for Redis: only correct with a single worker
+class MemoryLikeStore:
+    def __init__(self):
+        self._pending = {}
+        self._delta = Counter()
+        self._flushing = {}
+        self._flushing_delta = Counter()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def record(self, user_id, post_id, state, db_state):
+        field = _field(user_id, post_id)
+        with self._lock:
+            base = self._flushing.get(field, db_state)
+            if self._pending.get(field, base) == state:
+                return False
+            if state == base:
+                self._pending.pop(field, None)
+            else:
+                self._pending[field] = state
+            self._delta[post_id] += 1 if state == LIKED else -1
+            return True
+
+    def state(self, user_id, post_id):
+        field = _field(user_id, post_id)
+        with self._lock:
+            return self._pending.get(field, self._flushing.get(field))
+
+    def states(self, user_id, post_ids):
+        return {
+            post_id: state for post_id in post_ids
+            if (state := self.state(user_id, post_id)) is not None
+        }
+
+    def deltas(self, post_ids):
+        with self._lock:
+            return {
+                post_id: self._delta[post_id] + self._flushing_delta[post_id]
+                for post_id in post_ids
+            }
+
+    def begin_flush(self, timeout):
+        if not self._flush_lock.acquire(blocking=False):
+            return None
+        with self._lock:
+            if not self._flushing:
+                self._flushing, self._pending = self._pending, {}
+                self._flushing_delta, self._delta = self._delta, Counter()
+            return dict(self._flushing)
+
+    def end_flush(self):
+        with self._lock:
+            self._flushing = {}
+            self._flushing_delta = Counter()
+        self._flush_lock.release()
+
+    def abort_flush(self):
+        self._flush_lock.release()
+
+
+# Write-behind likes for hot posts.
+#
+# With LIKE_BUFFER_ENABLED, like/unlike only check the current state and
+# record the intent in Redis (LIKE_BUFFER_REDIS_URL) or, without Redis, in
+# process memory. Only the latest intent per (user, post) is kept, along
+# with a pending like_count delta per post. Every LIKE_BUFFER_FLUSH_INTERVAL
+# seconds one worker takes the pending intents and applies them in
+# batches: INSERT ... ON CONFLICT DO NOTHING for likes, DELETE for unlikes,
+# both with RETURNING so like_count moves by the rows that really changed.
+# Reads add the pending deltas to the stored counts (with_pending_counts for
+# every post payload), and a user's own pending intent wins over the table,
+# so a like shows up at once.
+class LikeBuffer:
+    def __init__(self, app=None):
+        self.app = None
+        self.store = None
+        self.interval = 1.0
+        self.batch_size = 500
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("LIKE_BUFFER_ENABLED", False)
+        app.config.setdefault("LIKE_BUFFER_REDIS_URL", None)
+        app.config.setdefault("LIKE_BUFFER_FLUSH_INTERVAL", 1.0)
+        app.config.setdefault("LIKE_BUFFER_BATCH_SIZE", 500)
+
+        self.app = app
+        self.interval = app.config["LIKE_BUFFER_FLUSH_INTERVAL"]
+        self.batch_size = app.config["LIKE_BUFFER_BATCH_SIZE"]
+        self._thread = None
+
+        if not app.config["LIKE_BUFFER_ENABLED"]:
+            self.store = None
+        elif app.config["LIKE_BUFFER_REDIS_URL"]:
+            self.store = RedisLikeStore(app.config["LIKE_BUFFER_REDIS_URL"])
+        else:
+            self.store = MemoryLikeStore()
+
+        app.extensions["like_buffer"] = self
+
+    @property
+    def enabled(self):
+        return self.store is not None
+
+    # Records a like (liked=True) or unlike. db_liked is whether the row
+    # exists in the table right now. Returns False if nothing would change.
+    def record(self, user_id, post_id, liked, db_liked):
+        self._ensure_flusher()
+        return self.store.record(
+            user_id, post_id, LIKED if liked else UNLIKED, LIKED if db_liked else UNLIKED
+        )
+
+    def liked_states(self, user_id, post_ids):
+        return {
+            post_id: state == LIKED
+            for post_id, state in self.store.states(user_id, post_ids).items()
+        }
+
+    def count_deltas(self, post_ids):
+        return self.store.deltas(post_ids)
+
+    # Adds the pending deltas to the like_count of serialized posts, in place
+    def with_pending_counts(self, items):
+        if not self.enabled or not items:
+            return items
+
+        deltas = self.store.deltas([item["id"] for item in items])
+        for item in items:
+            item["like_count"] += deltas[item["id"]]
+        return items
+
+    # the flusher thread is started per process; under TESTING call flush()
+    def _ensure_flusher(self):
+        if self.app.testing:
+            return
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="like-flusher", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                with self.app.app_context():
+                    self.flush()
+            except Exception:
+                logger.exception("like buffer flush failed")
+
+    def flush(self):
+        intents = self.store.begin_flush(timeout=max(30, self.interval * 10))
+        if intents is None:
+            return 0
+
+        try:
+            changed = self._apply(intents)
+        except Exception:
+            db.session.rollback()
+            # keep the batch for the next flush to retry
+            self.store.abort_flush()
+            raise
+
+        self.store.end_flush()
+        for post_id, amount in changed.items():
+            cache.invalidate("posts", f"post:{post_id}")
+            trending.record(post_id, likes=amount)
+        return len(intents)
+
+    def _existing_posts(self, post_ids):
+        post_ids = sorted(post_ids)
+        existing = set()
+        for start in range(0, len(post_ids), self.batch_size):
+            existing.update(db.session.execute(
+                db.select(Post.id)
+                .where(Post.id.in_(post_ids[start:start + self.batch_size]))
+                .with_for_update(read=True)
+            ).scalars())
+        return existing
+
+    def _apply(self, intents):
+        likes, unlikes = [], []
+        for field, state in intents.items():
+            user_id, post_id = _parse_field(field)
+            (likes if state == LIKED else unlikes).append((user_id, post_id))
+
+        # posts deleted since the like was buffered would fail the foreign
+        # key and with it every retry of this batch; the shared row locks
+        # keep the rest from being deleted until we commit
+        existing = self._existing_posts({post_id for _, post_id in likes})
+        likes = [like for like in likes if like[1] in existing]
+
+        changes = Counter()
+
+        for start in range(0, len(likes), self.batch_size):
+            rows = [
+                {"user_id": user_id, "post_id": post_id}
+                for user_id, post_id in likes[start:start + self.batch_size]
+            ]
+            for post_id in db.session.execute(
+                insert_ignoring_conflicts(Like, ["user_id", "post_id"]).returning(Like.post_id), rows
+            ).scalars():
+                changes[post_id] += 1
+
+        for start in range(0, len(unlikes), self.batch_size):
+            pairs = unlikes[start:start + self.batch_size]
+            result = db.session.execute(
+                db.delete(Like)
+                .where(db.tuple_(Like.user_id, Like.post_id).in_(pairs))
+                .returning(Like.post_id)
+            )
+            for post_id in result.scalars():
+                changes[post_id] -= 1
+
+        for post_id, amount in changes.items():
+            if amount:
+                Post.increment(post_id, "like_count", amount)
+
+        db.session.commit()
+        return {post_id: amount for post_id, amount in changes.items() if amount}
+
+
+like_buffer = LikeBuffer()
@@ -1,38 +1,107 @@
-from app.models import Post
-from app.extensions import db
+from flask import current_app
+from app.models import Counter, Post, User
+from app.extensions import db, cache
+from app.utils.pagination import keyset_page
+from app.services.search_service import search_posts
+from app.services.trending import trending
+from app.services.like_buffer import like_buffer
+from app.services import totals
+
+# Drop cached responses that contain this post
+def invalidate_post_cache(post_id, comments=False):
+    tags = ["posts", f"post:{post_id}"]
+    if comments:
+        tags.append(f"comments:{post_id}")
+    cache.invalidate(*tags)
 
 # Post_routes.get_posts
 def get_posts(page, per_page, search):
     query = Post.query
 
     if search:
-        query = query.filter(Post.title.ilike(F"%{search}%"))
+        query = search_posts(query, search)
     
     pagination = query.order_by(Post.id.desc()).paginate(
         page=page,
         per_page=per_page,
+        max_per_page=current_app.config["MAX_PER_PAGE"],
         error_out=False
     )
 
     return pagination.items, pagination
 
+# Post_routes.get_posts (cursor mode)
+def get_posts_by_cursor(cursor, per_page, search, sort="new"):
+    query = Post.query
+
+    if search:
+        # keyset order is (created_at, id), so no relevance ranking here
+        query = search_posts(query, search, rank=False)
+
+    return keyset_page(
+        query,
+        Post.created_at,
+        Post.id,
+        cursor,
+        per_page,
+        descending=(sort != "old")
+    )
+
+# Post_routes.get_feed: posts with author and counts in a single joined
+# query, selecting columns only so no model instances (or lazy loads) happen
+FEED_COLUMNS = [
+    "id", "title", "excerpt", "created_at", "like_count", "comment_count",
+    "author_id", "username", "profile_pic"
+]
+
+def get_feed(cursor, per_page):
+    excerpt_length = current_app.config["FEED_EXCERPT_LENGTH"]
+
+    query = db.session.query(
+        Post.id,
+        Post.title,
+        db.func.substr(Post.content, 1, excerpt_length).label("excerpt"),
+        Post.created_at,
+        Post.like_count,
+        Post.comment_count,
+        Post.author_id,
+        User.username,
+        User.profile_pic
+    ).join(User, User.id == Post.author_id)
+
+    return keyset_page(query, Post.created_at, Post.id, cursor, per_page)
+
 # get_my_posts
 def get_my_posts(page, per_page, search, user_id):
-    query = Post.query.filter_by(user_id=user_id)
+    query = Post.query.filter_by(author_id=user_id)
 
     if search:
-        query = query.filter(
-            Post.title.ilike(f"%{search}%") |
-            Post.content.ilike(f"%{search}%")
-        )
+        query = search_posts(query, search)
 
-    pagination = query.order_by(Post.id.desc()).paginate(
+    # newest first, like cursor mode: served by ix_posts_author_id_created_at_id
+    pagination = query.order_by(Post.created_at.desc(), Post.id.desc()).paginate(
         page=page,
         per_page=per_page,
-        error_out=False
+        max_per_page=current_app.config["MAX_PER_PAGE"],
+        error_out=False,
+        count=False
     )
 
-    return pagination.items, pagination
+    if search:
+        total, exact = totals.filtered_total(query, f"user:{user_id}", search)
+    else:
+        total, exact = totals.user_posts_total(user_id)
+
+    return pagination.items, totals.page_fields(pagination, total, exact)
+
+# get_my_posts (cursor mode)
+def get_my_posts_by_cursor(cursor, per_page, search, user_id):
+    query = Post.query.filter_by(author_id=user_id)
+
+    if search:
+        query = search_posts(query, search, rank=False)
+
+    return keyset_page(query, Post.created_at, Post.id, cursor, per_page)
 
 # Create_post
 def create_post(user_id, title, content):
@@ -42,9 +111,29 @@ def create_post(user_id, title, content):
         author_id=user_id
     )
     db.session.add(new_post)
+    User.increment(user_id, "post_count")
+    Counter.increment("posts")
     db.session.commit()
+    cache.invalidate("posts")
+    trending.post_created(new_post)
     return new_post
 
+# Version for the post's ETag, without loading the row
+def get_post_version(post_id):
+    version = db.session.execute(
+        db.select(Post.updated_at).where(Post.id == post_id)
+    ).scalar()
+
+    # buffered likes change the payload without touching updated_at
+    if version is not None and like_buffer.enabled:
+        return f"{version}:{like_buffer.count_deltas([post_id])[post_id]}"
+    return version
+
+# Post_routes.get_posts (?ids=), one query, in the order asked for
+def get_posts_by_ids(ids):
+    posts = {post.id: post for post in Post.query.filter(Post.id.in_(ids))}
+    return [posts[post_id] for post_id in ids if post_id in posts]
+
 # Get_single_post
 def get_post_by_id(post_id):
     post = Post.query.get(post_id)
@@ -68,6 +157,7 @@ def update_post(post_id, user_id, data):
     post.content = data.get("content")
 
     db.session.commit()
+    invalidate_post_cache(post_id)
 
     return post, None
 
@@ -81,7 +171,21 @@ def delete_post(post_id, user_id):
     if post.author_id != user_id:
         return "forbidden"
 
-    db.session.delete(post)
+    # only the request that really removed the row moves the counters
+    deleted = db.session.execute(
+        db.delete(Post)
+        .where(Post.id == post_id)
+        .returning(Post.id)
+    ).scalar()
+
+    if deleted is None:
+        db.session.rollback()
+        return "not_found"
+
+    User.increment(user_id, "post_count", -1)
+    Counter.increment("posts", -1)
     db.session.commit()
+    invalidate_post_cache(post_id, comments=True)
+    trending.post_deleted(post_id)
 
     return None
@@ -0,0 +1,123 @@
+import re
+from sqlalchemy import event, func, literal_column, text, table, column, DDL
+from app.models import Post
+from app.extensions import db
+
+# Full-text search over posts.title and posts.content.
+#
+# Postgres: a generated tsvector column with a GIN index, so the index is kept
+# in sync by the database itself.
+# SQLite: an external-content FTS5 table kept in sync with triggers.
+#
+# Neither lives on the Post model, because db.create_all() has to work on both
+# dialects. The DDL below runs whenever the posts table is created or dropped
+# and the migration adds the same objects to existing databases.
+
+PG_SEARCH_DDL = [
+    """
+    ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts USING GIN (search_vector)",
+]
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, content, content='posts', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    "INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')",
+]
+
+posts_fts = table("posts_fts", column("rowid"))
+
+for statement in PG_SEARCH_DDL:
+    event.listen(
+        Post.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql")
+    )
+
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        Post.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite")
+    )
+
+event.listen(
+    Post.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS posts_fts").execute_if(dialect="sqlite")
+)
+
+
+def _terms(search):
+    return re.findall(r"\w+", search.lower())
+
+
+# Filter a Post query by a search string. With rank=True the query is also
+# ordered by relevance (further order_by calls only break ties).
+def search_posts(query, search, rank=True):
+    terms = _terms(search)
+
+    if not terms:
+        return query
+
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        # prefix match on every term, so results update while typing
+        tsquery = func.to_tsquery("english", " & ".join(f"{t}:*" for t in terms))
+        search_vector = literal_column("posts.search_vector")
+
+        query = query.filter(search_vector.op("@@")(tsquery))
+        if rank:
+            query = query.order_by(func.ts_rank(search_vector, tsquery).desc())
+        return query
+
+    if dialect == "sqlite":
+        match = " ".join(f'"{t}"*' for t in terms)
+
+        query = query.join(
+            posts_fts, posts_fts.c.rowid == Post.id
+        ).filter(
+            text("posts_fts MATCH :fts_match").bindparams(fts_match=match)
+        )
+        if rank:
+            # bm25 scores are negative, lower is better; title weighs more
+            query = query.order_by(text("bm25(posts_fts, 10.0, 1.0)"))
+        return query
+
+    # other backends: plain substring match
+    for term in terms:
+        query = query.filter(
+            Post.title.ilike(f"%{term}%") |
+            Post.content.ilike(f"%{term}%")
+        )
+    return query
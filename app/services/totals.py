@@ -0,0 +1,76 @@
+import hashlib
+import math
+from flask import current_app
+from app.extensions import db, cache
+from app.models import Counter, Post, User
+
+
+# Totals for the page-numbered listings, as (total, exact).
+#
+# Unfiltered listings read a maintained counter (Counter "posts",
+# User.post_count), which is exact and costs a primary key lookup. Filtered
+# ones (search) run COUNT(*) once and keep the result for TOTALS_CACHE_TTL
+# seconds; a cached count may be that old, so it is flagged as not exact.
+# With TOTALS_USE_ESTIMATES on Postgres, filtered totals above
+# TOTALS_ESTIMATE_THRESHOLD come from the planner's row estimate instead,
+# which skips the count entirely but can be far off.
+
+def posts_total():
+    value = db.session.execute(
+        db.select(Counter.value).where(Counter.name == "posts")
+    ).scalar()
+
+    # the row comes from the migration or `flask counters reconcile`;
+    # without it count, but never write from a read request
+    if value is None:
+        value = db.session.execute(db.select(db.func.count(Post.id))).scalar()
+
+    return value, True
+
+
+def user_posts_total(user_id):
+    value = db.session.execute(
+        db.select(User.post_count).where(User.id == user_id)
+    ).scalar()
+    return value or 0, True
+
+
+def filtered_total(query, scope, search):
+    digest = hashlib.sha1(search.encode()).hexdigest()
+    key = f"total:{scope}:{digest}"
+
+    cached = cache.backend.get_many([key])[0]
+    if cached is not None:
+        return cached, False
+
+    query = query.order_by(None)
+
+    if current_app.config["TOTALS_USE_ESTIMATES"] and db.engine.dialect.name == "postgresql":
+        estimate = _planner_estimate(query)
+        if estimate >= current_app.config["TOTALS_ESTIMATE_THRESHOLD"]:
+            return estimate, False
+
+    total = query.count()
+    cache.backend.set(key, total, current_app.config["TOTALS_CACHE_TTL"])
+    return total, True
+
+
+def _planner_estimate(query):
+    compiled = query.statement.compile(dialect=db.engine.dialect)
+    plan = db.session.connection().exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+    ).scalar()
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+# Page fields for a paginate(count=False) result and a total from above
+def page_fields(pagination, total, exact):
+    pages = math.ceil(total / pagination.per_page) if total else 0
+    return {
+        "total": total,
+        "total_exact": exact,
+        "pages": pages,
+        "current_page": pagination.page,
+        "has_next": pagination.page < pages,
+        "has_prev": pagination.page > 1
+    }
@@ -0,0 +1,308 @@
+import os
+import threading
+import time
+import redis
+from datetime import datetime, timezone
+from app.extensions import db
+from app.models import Post
+from app.utils.logger import setup_logger
+from app.utils.pagination import encode_score_cursor, decode_score_cursor
+
+logger = setup_logger()
+
+
+def _timestamp(created_at):
+    return created_at.replace(tzinfo=timezone.utc).timestamp()
+
+
+# Adds amount (already weighted) times the post's factor. Posts without a
+# factor are outside the window and ignored; a score that drops to zero
+# leaves the set.
+RECORD_SCRIPT = """
+local factor = redis.call('HGET', KEYS[2], ARGV[1])
+if not factor then return 0 end
+local score = tonumber(redis.call('ZINCRBY', KEYS[1], ARGV[2] * factor, ARGV[1]))
+if score <= factor * 1e-9 then redis.call('ZREM', KEYS[1], ARGV[1]) end
+return 1
+"""
+
+# Factor of a new post against the current epoch, read in the same step so a
+# concurrent rebase can't leave it on the old one
+ADD_POST_SCRIPT = """
+local epoch = redis.call('GET', KEYS[2])
+if not epoch then return 0 end
+redis.call('HSET', KEYS[1], ARGV[1], 2 ^ ((ARGV[2] - epoch) / ARGV[3]))
+return 1
+"""
+
+# One page below the cursor's score. Posts tied with it come back too and
+# are skipped by the caller, so the page is ZCOUNT longer.
+PAGE_SCRIPT = """
+local ties = redis.call('ZCOUNT', KEYS[1], ARGV[1], ARGV[1])
+return redis.call('ZREVRANGEBYSCORE', KEYS[1], ARGV[1], '-inf', 'WITHSCORES',
+                  'LIMIT', 0, tonumber(ARGV[2]) + ties)
+"""
+
+
+class RedisTrendingStore:
+    scores = "trending:scores"
+    factors = "trending:factors"
+    epoch_key = "trending:epoch"
+    lock = "trending:rebase-lock"
+
+    def __init__(self, url):
+        self._client = redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._record = self._client.register_script(RECORD_SCRIPT)
+        self._add_post = self._client.register_script(ADD_POST_SCRIPT)
+        self._page = self._client.register_script(PAGE_SCRIPT)
+
+    @property
+    def epoch(self):
+        value = self._client.get(self.epoch_key)
+        return float(value) if value is not None else None
+
+    def record(self, post_id, amount):
+        self._record(keys=[self.scores, self.factors], args=[post_id, amount])
+
+    def add_post(self, post_id, created, half_life):
+        self._add_post(keys=[self.factors, self.epoch_key], args=[post_id, created, half_life])
+
+    def remove_post(self, post_id):
+        pipe = self._client.pipeline()
+        pipe.zrem(self.scores, post_id)
+        pipe.hdel(self.factors, post_id)
+        pipe.execute()
+
+    def page(self, after, limit):
+        if after is None:
+            rows = self._client.zrevrange(self.scores, 0, limit - 1, withscores=True)
+        else:
+            raw = self._page(keys=[self.scores], args=[repr(after[0]), limit])
+            rows = [(raw[i], float(raw[i + 1])) for i in range(0, len(raw), 2)]
+        return [(member.decode(), score) for member, score in rows]
+
+    def try_lock(self, timeout):
+        return bool(self._client.set(self.lock, os.getpid(), nx=True, px=int(timeout * 1000)))
+
+    def unlock(self):
+        self._client.delete(self.lock)
+
+    def replace(self, epoch, factors, scores):
+        pipe = self._client.pipeline(transaction=True)
+        pipe.delete(self.scores, self.factors)
+        if factors:
+            pipe.hset(self.factors, mapping=factors)
+        if scores:
+            pipe.zadd(self.scores, scores)
+        pipe.set(self.epoch_key, repr(epoch))
+        pipe.execute()
+
+
+# Process-local stand-in for Redis: only correct with a single worker, and
+# pages sort the whole set, which is fine for tests and small sites
+class MemoryTrendingStore:
+    def __init__(self):
+        self.epoch = None
+        self._scores = {}
+        self._factors = {}
+        self._lock = threading.Lock()
+        self._rebase_lock = threading.Lock()
+
+    def record(self, post_id, amount):
+        member = str(post_id)
+        with self._lock:
+            factor = self._factors.get(member)
+            if factor is None:
+                return
+            score = self._scores.get(member, 0) + amount * factor
+            if score <= factor * 1e-9:
+                self._scores.pop(member, None)
+            else:
+                self._scores[member] = score
+
+    def add_post(self, post_id, created, half_life):
+        with self._lock:
+            if self.epoch is not None:
+                self._factors[str(post_id)] = 2 ** ((created - self.epoch) / half_life)
+
+    def remove_post(self, post_id):
+        with self._lock:
+            self._scores.pop(str(post_id), None)
+            self._factors.pop(str(post_id), None)
+
+    def page(self, after, limit):
+        with self._lock:
+            rows = sorted(
+                ((member, score) for member, score in self._scores.items()),
+                key=lambda row: (row[1], row[0]),
+                reverse=True
+            )
+        if after is None:
+            return rows[:limit]
+        # like the Redis script: the page plus whatever ties with the cursor
+        ties = sum(1 for row in rows if row[1] == after[0])
+        return [row for row in rows if row[1] <= after[0]][:limit + ties]
+
+    def try_lock(self, timeout):
+        return self._rebase_lock.acquire(blocking=False)
+
+    def unlock(self):
+        self._rebase_lock.release()
+
+    def replace(self, epoch, factors, scores):
+        with self._lock:
+            self.epoch = epoch
+            self._factors = dict(factors)
+            self._scores = dict(scores)
+
+
+# Trending posts ranked by time-decayed engagement.
+#
+# A post's hot score is (likes * TRENDING_LIKE_WEIGHT + comments *
+# TRENDING_COMMENT_WEIGHT) halved every TRENDING_HALF_LIFE_HOURS of its age.
+# Decaying every score as time passes would mean rewriting the whole set, so
+# the set instead stores engagement * 2^((created - epoch) / half_life): the
+# order is the same at any moment, and a like or comment only adds its
+# weight times the post's fixed factor (ZINCRBY, O(log n)). The factors of
+# posts created within TRENDING_WINDOW_HOURS live in a hash; older posts
+# drop out.
+#
+# Every TRENDING_REBASE_INTERVAL seconds one worker rebuilds both from the
+# posts' counters with a fresh epoch, which keeps the factors small and
+# repairs anything an outage or a race made us miss. Redis errors on the
+# write paths are logged and left for that rebase.
+class Trending:
+    def __init__(self, app=None):
+        self.app = None
+        self.store = None
+        self.half_life = 12 * 3600
+        self.window = 72 * 3600
+        self.interval = 600
+        self.like_weight = 1.0
+        self.comment_weight = 2.0
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("TRENDING_REDIS_URL", None)
+        app.config.setdefault("TRENDING_HALF_LIFE_HOURS", 12)
+        app.config.setdefault("TRENDING_WINDOW_HOURS", 72)
+        app.config.setdefault("TRENDING_REBASE_INTERVAL", 600)
+        app.config.setdefault("TRENDING_LIKE_WEIGHT", 1.0)
+        app.config.setdefault("TRENDING_COMMENT_WEIGHT", 2.0)
+
+        self.app = app
+        self.half_life = app.config["TRENDING_HALF_LIFE_HOURS"] * 3600
+        self.window = app.config["TRENDING_WINDOW_HOURS"] * 3600
+        self.interval = app.config["TRENDING_REBASE_INTERVAL"]
+        self.like_weight = app.config["TRENDING_LIKE_WEIGHT"]
+        self.comment_weight = app.config["TRENDING_COMMENT_WEIGHT"]
+        self._thread = None
+
+        if app.config["TRENDING_REDIS_URL"]:
+            self.store = RedisTrendingStore(app.config["TRENDING_REDIS_URL"])
+        else:
+            self.store = MemoryTrendingStore()
+
+        app.extensions["trending"] = self
+
+    def _safely(self, action, *args):
+        try:
+            action(*args)
+        except redis.RedisError as e:
+            logger.warning("trending update failed: %s", e)
+
+    def post_created(self, post):
+        self._ensure_rebaser()
+        self._safely(self.store.add_post, post.id, _timestamp(post.created_at), self.half_life)
+
+    def post_deleted(self, post_id):
+        self._safely(self.store.remove_post, post_id)
+
+    def record(self, post_id, likes=0, comments=0):
+        self._ensure_rebaser()
+        amount = likes * self.like_weight + comments * self.comment_weight
+        if amount:
+            self._safely(self.store.record, post_id, amount)
+
+    # One page of (post_id, hot score) below the cursor, and the next cursor
+    def page(self, cursor, per_page):
+        after = decode_score_cursor(cursor) if cursor else None
+
+        epoch = self.store.epoch
+        if epoch is None:
+            self.rebase()
+            epoch = self.store.epoch
+
+        rows = self.store.page(after, per_page + 1)
+        if after is not None:
+            score, post_id = after
+            rows = [
+                row for row in rows
+                if not (row[1] == score and row[0] >= str(post_id))
+            ][:per_page + 1]
+
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_cursor = encode_score_cursor(rows[-1][1], int(rows[-1][0]))
+
+        # back from stored to decayed scores
+        scale = 2 ** (((epoch or time.time()) - time.time()) / self.half_life)
+        return [(int(member), score * scale) for member, score in rows], next_cursor
+
+    # the rebase thread is started per process; under TESTING call rebase()
+    def _ensure_rebaser(self):
+        if self.app.testing:
+            return
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="trending-rebase", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    self.rebase()
+            except Exception:
+                logger.exception("trending rebase failed")
+            time.sleep(self.interval)
+
+    # Rebuilds the set from the posts' counters; returns the number of
+    # posts in the window, or None if another worker is rebasing
+    def rebase(self):
+        if not self.store.try_lock(timeout=max(60, self.interval)):
+            return None
+
+        try:
+            now = time.time()
+            epoch = now - self.window
+            rows = db.session.execute(
+                db.select(Post.id, Post.created_at, Post.like_count, Post.comment_count)
+                .where(Post.created_at >= datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None))
+            ).all()
+
+            factors, scores = {}, {}
+            for post_id, created_at, like_count, comment_count in rows:
+                factor = 2 ** ((_timestamp(created_at) - epoch) / self.half_life)
+                factors[str(post_id)] = factor
+                engagement = like_count * self.like_weight + comment_count * self.comment_weight
+                if engagement > 0:
+                    scores[str(post_id)] = engagement * factor
+
+            self.store.replace(epoch, factors, scores)
+            return len(rows)
+        finally:
+            self.store.unlock()
+
+
+trending = Trending()
@@ -1,5 +1,5 @@
-from flasgger import Swagger
-from app import app
+import json
+import os
 
 swagger_config = {
     "headers" : [],
@@ -37,5 +37,27 @@ swagger_template = {
     ]
 }
 
-Swagger(app, config=swagger_config, template=swagger_template)
+# Swagger UI on /docs/ and the spec on /apispec.json. flasgger (and the
+# jsonschema/YAML stack behind it) is only imported when docs are enabled,
+# and it builds the spec from the view docstrings on the first
+# /apispec.json hit, then serves it from memory. A spec exported with
+# `flask docs export` and named in SWAGGER_SPEC_FILE is served as is, so
+# even that first build is skipped.
+def init_docs(app):
+    app.config.setdefault("SWAGGER_ENABLED", True)
+    app.config.setdefault("SWAGGER_SPEC_FILE", None)
+
+    if not app.config["SWAGGER_ENABLED"]:
+        return None
+
+    from flasgger import Swagger
+
+    swagger = Swagger(app, config=swagger_config, template=swagger_template)
+
+    spec_file = app.config["SWAGGER_SPEC_FILE"]
+    if spec_file and os.path.exists(spec_file):
+        with open(spec_file) as f:
+            swagger.apispecs["apispec"] = json.load(f)
+
+    return swagger
 
@@ -0,0 +1,375 @@
+import json
+import math
+import random
+import threading
+import time
+import uuid
+import redis
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+from flask import g, request, make_response, current_app
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+# In-process LRU with per-entry TTL. Counters set through incr() (the tag
+# versions) live outside the LRU so eviction can never reset them.
+class MemoryCache:
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        values = []
+
+        with self._lock:
+            for key in keys:
+                if key in self._counters:
+                    values.append(self._counters[key])
+                    continue
+
+                entry = self._entries.get(key)
+                if entry is None or entry[0] < now:
+                    self._entries.pop(key, None)
+                    values.append(None)
+                    continue
+
+                self._entries.move_to_end(key)
+                values.append(entry[1])
+
+        return values
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    # one process only, which the in-process single-flight already covers
+    def lock(self, key, timeout):
+        return "local"
+
+    def unlock(self, key, token):
+        pass
+
+
+# Deletes the lock only if it still holds our token, so a lock that expired
+# and was taken by another worker is left alone.
+UNLOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+# Shared cache in Redis. Errors are logged and treated as misses so a Redis
+# outage only costs the cache, not the request.
+class RedisCache:
+    def __init__(self, url, prefix="cache:"):
+        self.prefix = prefix
+        self._client = redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._unlock = self._client.register_script(UNLOCK_SCRIPT)
+
+    def get_many(self, keys):
+        try:
+            raw = self._client.mget([self.prefix + key for key in keys])
+        except redis.RedisError as e:
+            logger.warning("cache get failed: %s", e)
+            return [None] * len(keys)
+
+        return [json.loads(value) if value is not None else None for value in raw]
+
+    def set(self, key, value, timeout):
+        try:
+            self._client.set(self.prefix + key, json.dumps(value), ex=timeout)
+        except redis.RedisError as e:
+            logger.warning("cache set failed: %s", e)
+
+    def delete(self, key):
+        try:
+            self._client.delete(self.prefix + key)
+        except redis.RedisError as e:
+            logger.warning("cache delete failed: %s", e)
+
+    def incr(self, key):
+        try:
+            return self._client.incr(self.prefix + key)
+        except redis.RedisError as e:
+            logger.warning("cache incr failed: %s", e)
+
+    # Short lock across workers; returns a token, or None if another worker
+    # holds it. Without Redis every worker computes for itself.
+    def lock(self, key, timeout):
+        token = uuid.uuid4().hex
+        try:
+            if self._client.set(self.prefix + key, token, nx=True, px=int(timeout * 1000)):
+                return token
+            return None
+        except redis.RedisError as e:
+            logger.warning("cache lock failed: %s", e)
+            return token
+
+    def unlock(self, key, token):
+        try:
+            self._unlock(keys=[self.prefix + key], args=[token])
+        except redis.RedisError as e:
+            logger.warning("cache unlock failed: %s", e)
+
+
+class NullCache:
+    def get_many(self, keys):
+        return [None] * len(keys)
+
+    def set(self, key, value, timeout):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def incr(self, key):
+        pass
+
+    def lock(self, key, timeout):
+        return "null"
+
+    def unlock(self, key, token):
+        pass
+
+
+# Read-through cache for GET responses.
+#
+# Every entry records the version of each tag it depends on ("posts",
+# "post:<id>", "comments:<post_id>", ...). invalidate() bumps a tag's version,
+# which makes exactly the entries carrying that tag stale without having to
+# find or delete them.
+#
+# Misses are single-flight: per key only one request in the process renders
+# the view, and a short lock in the backend (CACHE_LOCK_TIMEOUT) keeps other
+# workers out too. The rest wait for its entry, or get the expired entry
+# (X-Cache: STALE) if there is one; entries are kept CACHE_STALE_TTL seconds
+# past their timeout for that. A request may also refresh an entry before it
+# expires, with a probability that grows as expiry nears and with how long
+# the view took to render (CACHE_EARLY_REFRESH_BETA, 0 turns it off), so hot
+# keys are usually recomputed by one request before they ever expire.
+#
+# With read replicas, requests pinned to the primary (read_from_replica is
+# False) neither read nor store entries, so a writer always sees its own
+# write. A response rendered from a replica is not stored while one of its
+# tags was invalidated less than READ_YOUR_WRITES_SECONDS ago: the replica
+# may still lag behind that write, and the entry would carry the new
+# version.
+class ResponseCache:
+    def __init__(self, app=None):
+        self.backend = NullCache()
+        self.lock_timeout = 5.0
+        self.stale_ttl = 30
+        self.beta = 1.0
+        self.replica_lag = 0
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("CACHE_TYPE", "memory")
+        app.config.setdefault("CACHE_DEFAULT_TIMEOUT", 60)
+        app.config.setdefault("CACHE_MAX_ENTRIES", 1024)
+        app.config.setdefault("CACHE_REDIS_URL", None)
+        app.config.setdefault("CACHE_LOCK_TIMEOUT", 5.0)
+        app.config.setdefault("CACHE_STALE_TTL", 30)
+        app.config.setdefault("CACHE_EARLY_REFRESH_BETA", 1.0)
+
+        cache_type = app.config["CACHE_TYPE"]
+
+        if cache_type == "redis" and app.config["CACHE_REDIS_URL"]:
+            self.backend = RedisCache(app.config["CACHE_REDIS_URL"])
+        elif cache_type in ("memory", "redis"):
+            self.backend = MemoryCache(app.config["CACHE_MAX_ENTRIES"])
+        else:
+            self.backend = NullCache()
+
+        self.lock_timeout = app.config["CACHE_LOCK_TIMEOUT"]
+        self.stale_ttl = app.config["CACHE_STALE_TTL"]
+        self.beta = app.config["CACHE_EARLY_REFRESH_BETA"]
+        self.replica_lag = (
+            app.config.get("READ_YOUR_WRITES_SECONDS", 0)
+            if app.config.get("SQLALCHEMY_REPLICA_URIS") else 0
+        )
+
+        app.extensions["response_cache"] = self
+
+    @staticmethod
+    def make_key():
+        args = sorted(request.args.items(multi=True))
+        return f"view:{request.path}?{urlencode(args)}"
+
+    @staticmethod
+    def _tag_key(tag):
+        return f"tag:{tag}"
+
+    @staticmethod
+    def _invalidated_key(tag):
+        return f"tag-invalidated:{tag}"
+
+    # False for a replica read while a write to one of the tags may not have
+    # reached the replicas yet
+    def _storable(self, entry_tags):
+        if not self.replica_lag or not g.get("read_from_replica"):
+            return True
+
+        now = time.time()
+        invalidated = self.backend.get_many([self._invalidated_key(tag) for tag in entry_tags])
+        return all(at is None or now - at >= self.replica_lag for at in invalidated)
+
+    # The entry if it is still valid for the current tag versions, and the
+    # versions themselves. Versions are read before the view runs, so a
+    # write that lands while we render leaves the new entry already stale.
+    def _lookup(self, key, tag_keys):
+        entry, *versions = self.backend.get_many([key] + tag_keys)
+        versions = [v or 0 for v in versions]
+
+        if entry is not None and entry["versions"] != versions:
+            entry = None
+        return entry, versions
+
+    @staticmethod
+    def _expired(entry, now):
+        return now >= entry.get("expires_at", math.inf)
+
+    # XFetch: refresh early with probability rising towards expiry
+    def _should_refresh(self, entry, now):
+        if self._expired(entry, now):
+            return True
+        if self.beta <= 0:
+            return False
+        early = entry.get("delta", 0) * self.beta * -math.log(1 - random.random())
+        return now + early >= entry.get("expires_at", math.inf)
+
+    @staticmethod
+    def _respond(entry, state):
+        response = current_app.response_class(
+            entry["body"],
+            status=entry["status"],
+            mimetype="application/json"
+        )
+        response.headers["X-Cache"] = state
+        return response
+
+    # the entry we already have, while someone else refreshes it
+    def _respond_previous(self, entry):
+        return self._respond(entry, "STALE" if self._expired(entry, time.time()) else "HIT")
+
+    def _render(self, view, args, kwargs, key, versions, timeout, entry_tags):
+        start = time.perf_counter()
+        response = make_response(view(*args, **kwargs))
+        delta = time.perf_counter() - start
+
+        if (
+            response.status_code == 200
+            and not response.is_streamed
+            and self._storable(entry_tags)
+        ):
+            self.backend.set(
+                key,
+                {
+                    "body": response.get_data(as_text=True),
+                    "status": response.status_code,
+                    "versions": versions,
+                    "expires_at": time.time() + timeout,
+                    "delta": delta
+                },
+                math.ceil(timeout + self.stale_ttl)
+            )
+        response.headers["X-Cache"] = "MISS"
+        return response
+
+    # Polls for a fresh entry rendered by another worker
+    def _wait_for_entry(self, key, tag_keys):
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.02)
+            entry, _ = self._lookup(key, tag_keys)
+            if entry is not None and not self._expired(entry, time.time()):
+                return entry
+        return None
+
+    def cached(self, tags, timeout=None):
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                # pinned to the primary for read-your-writes
+                if g.get("read_from_replica") is False:
+                    response = make_response(view(*args, **kwargs))
+                    response.headers["X-Cache"] = "BYPASS"
+                    return response
+
+                entry_tags = tags(**kwargs) if callable(tags) else list(tags)
+                tag_keys = [self._tag_key(tag) for tag in entry_tags]
+                key = self.make_key()
+                ttl = timeout or current_app.config["CACHE_DEFAULT_TIMEOUT"]
+
+                entry, versions = self._lookup(key, tag_keys)
+                if entry is not None and not self._should_refresh(entry, time.time()):
+                    return self._respond(entry, "HIT")
+
+                with self._flights_lock:
+                    flight = self._flights.get(key)
+                    leader = flight is None
+                    if leader:
+                        flight = self._flights[key] = threading.Event()
+
+                if not leader:
+                    if entry is not None:
+                        return self._respond_previous(entry)
+                    flight.wait(self.lock_timeout)
+                    entry, versions = self._lookup(key, tag_keys)
+                    if entry is not None and not self._expired(entry, time.time()):
+                        return self._respond(entry, "HIT")
+                    # the leader failed or is too slow: render without coalescing
+                    return self._render(view, args, kwargs, key, versions, ttl, entry_tags)
+
+                try:
+                    token = self.backend.lock(f"lock:{key}", self.lock_timeout)
+                    if token is None:
+                        if entry is not None:
+                            return self._respond_previous(entry)
+                        fresh = self._wait_for_entry(key, tag_keys)
+                        if fresh is not None:
+                            return self._respond(fresh, "HIT")
+                        _, versions = self._lookup(key, tag_keys)
+
+                    try:
+                        return self._render(view, args, kwargs, key, versions, ttl, entry_tags)
+                    finally:
+                        if token is not None:
+                            self.backend.unlock(f"lock:{key}", token)
+                finally:
+                    with self._flights_lock:
+                        self._flights.pop(key, None)
+                    flight.set()
+
+            return wrapper
+        return decorator
+
+    def invalidate(self, *tags):
+        for tag in tags:
+            self.backend.incr(self._tag_key(tag))
+            if self.replica_lag:
+                self.backend.set(self._invalidated_key(tag), time.time(), math.ceil(self.replica_lag))
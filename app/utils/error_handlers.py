@@ -1,4 +1,5 @@
 from app.utils.responses import error_response
+from app.utils.hashing import HashingPoolBusy
 from flask_limiter.errors import RateLimitExceeded
 from flask import jsonify
 
@@ -25,4 +26,10 @@ def register_error_handlers(app):
         return jsonify({
             "error": "Too many requests",
             "message": "Rate limit exceeded"
-        }), 429
\ No newline at end of file
+        }), 429
+
+    @app.errorhandler(HashingPoolBusy)
+    def handle_hashing_pool_busy(e):
+        response, status = error_response("Server busy, try again shortly", 503)
+        response.headers["Retry-After"] = "1"
+        return response, status
\ No newline at end of file
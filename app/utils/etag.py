@@ -0,0 +1,46 @@
+import hashlib
+from functools import wraps
+from flask import request, make_response, current_app
+
+
+# ETag from a version value (e.g. updated_at) fetched by `version(**view_args)`.
+# A matching If-None-Match gets a 304 before the view runs, so the row is
+# never loaded or serialized. `version` returns None when the resource does
+# not exist; the view then runs and produces its own 404.
+def etag_from_version(version):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            current = version(**kwargs)
+            if current is None:
+                return view(*args, **kwargs)
+
+            etag = hashlib.sha1(f"{request.full_path}:{current}".encode()).hexdigest()
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+                response.set_etag(etag)
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+            return response
+
+        return wrapper
+    return decorator
+
+
+# ETag from a hash of the response body, for listings that have no single
+# version column. Put it outside @cache.cached so cache hits are hashed
+# without touching the database.
+def etag_from_body(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200 and not response.is_streamed:
+            response.add_etag()
+            response.make_conditional(request)
+        return response
+
+    return wrapper
@@ -0,0 +1,118 @@
+import os
+import threading
+import bcrypt as bcrypt_lib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+class HashingPoolBusy(Exception):
+    pass
+
+
+# Run in the pool's worker processes, so they must stay module level
+def hash_password(password, rounds):
+    return bcrypt_lib.hashpw(password.encode("utf-8"), bcrypt_lib.gensalt(rounds)).decode("utf-8")
+
+
+def check_password(hashed, password):
+    return bcrypt_lib.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+# Cost factor stored in a bcrypt hash: $2b$<rounds>$<salt+digest>
+def hash_rounds(hashed):
+    return int(hashed.split("$")[2])
+
+
+# Runs bcrypt in a small process pool so a burst of logins cannot take
+# more than HASHING_POOL_WORKERS cores per app worker. At most
+# HASHING_POOL_MAX_PENDING hashes may be running or queued; past that
+# HashingPoolBusy is raised and the request gets a 503 straight away
+# instead of piling up behind the others. A request that gives up after
+# HASHING_POOL_TIMEOUT seconds cancels its hash if it hasn't started; one
+# already running keeps its slot until it finishes. HASHING_POOL_WORKERS=0
+# hashes inline in the request thread.
+class HashingPool:
+    def __init__(self, app=None):
+        self.workers = 0
+        self.rounds = 12
+        self.timeout = None
+        self._slots = None
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("BCRYPT_LOG_ROUNDS", 12)
+        app.config.setdefault("HASHING_POOL_WORKERS", 2)
+        app.config.setdefault("HASHING_POOL_MAX_PENDING", 8)
+        app.config.setdefault("HASHING_POOL_TIMEOUT", 10)
+
+        workers = app.config["HASHING_POOL_WORKERS"]
+        if workers != self.workers:
+            self._shutdown()
+
+        self.workers = workers
+        self.rounds = app.config["BCRYPT_LOG_ROUNDS"]
+        self.timeout = app.config["HASHING_POOL_TIMEOUT"]
+        self._slots = threading.BoundedSemaphore(app.config["HASHING_POOL_MAX_PENDING"])
+
+        app.extensions["hashing_pool"] = self
+
+    # created lazily and per process, so gunicorn workers forked from a
+    # preloaded app each get their own pool
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                self._pid = os.getpid()
+            return self._executor
+
+    def _shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HashingPoolBusy()
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BrokenProcessPool as e:
+            slots.release()
+            self._shutdown()
+            raise HashingPoolBusy() from e
+
+        # the slot is held until the hash is done, not until we stop
+        # waiting for it, so timed-out hashes still count as pending
+        future.add_done_callback(lambda _: slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError as e:
+            # drops it if it is still queued; a running hash can't be stopped
+            future.cancel()
+            raise HashingPoolBusy() from e
+        except BrokenProcessPool as e:
+            self._shutdown()
+            raise HashingPoolBusy() from e
+
+    def generate_password_hash(self, password):
+        return self._run(hash_password, password, self.rounds)
+
+    def check_password_hash(self, hashed, password):
+        return self._run(check_password, hashed, password)
+
+    def needs_rehash(self, hashed):
+        return hash_rounds(hashed) != self.rounds
+
+
+hashing_pool = HashingPool()
@@ -0,0 +1,188 @@
+import os
+import threading
+import time
+import redis
+from datetime import datetime, timezone
+from sqlalchemy import text
+from app.extensions import db
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+def _pool_stats(engine):
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        # SQLite memory/static pools have no fixed size
+        return None
+
+    size = pool.size()
+    checked_out = pool.checkedout()
+    capacity = size + max(pool._max_overflow, 0)
+    return {
+        "size": size,
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "saturation": round(checked_out / capacity, 3) if capacity else None
+    }
+
+
+# Dependency checks run off the request path.
+#
+# A daemon thread per worker probes the database (every engine, replicas
+# included) and Redis every HEALTH_PROBE_INTERVAL seconds and keeps the last
+# result. /health and /health/ready only read that result, so polling them
+# costs nothing and a hanging dependency delays the prober, not the
+# caller. Redis goes through one small shared pool with
+# HEALTH_PROBE_TIMEOUT socket timeouts. A result older than
+# HEALTH_MAX_AGE means the prober itself is stuck and counts as not ready.
+#
+# A probe publishes its result and timestamps as one tuple, so readers never
+# see one without the other. The first health request of a process probes
+# inline (others arriving meanwhile wait for it) and only then starts the
+# thread, which takes over after one interval.
+class HealthMonitor:
+    def __init__(self, app=None):
+        self.app = None
+        self.interval = 5.0
+        self.max_age = 15.0
+        self.redis = None
+        self._last = None
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("HEALTH_PROBE_INTERVAL", 5.0)
+        app.config.setdefault("HEALTH_PROBE_TIMEOUT", 1.0)
+        app.config.setdefault("HEALTH_MAX_AGE", 15.0)
+        app.config.setdefault("HEALTH_REDIS_URL", None)
+
+        self.stop()
+
+        self.app = app
+        self.interval = app.config["HEALTH_PROBE_INTERVAL"]
+        self.max_age = app.config["HEALTH_MAX_AGE"]
+        self._last = None
+
+        url = app.config["HEALTH_REDIS_URL"]
+        timeout = app.config["HEALTH_PROBE_TIMEOUT"]
+        self.redis = redis.Redis(connection_pool=redis.ConnectionPool.from_url(
+            url,
+            max_connections=2,
+            socket_timeout=timeout,
+            socket_connect_timeout=timeout
+        )) if url else None
+
+        app.extensions["health"] = self
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+        self._stop = threading.Event()
+
+    # started by the first health request of each process, so forked
+    # workers each run their own prober. Under TESTING there is no thread
+    # and the result is probed inline once it is an interval old.
+    def _ensure_prober(self):
+        if self.app.testing:
+            with self._lock:
+                if self._last is None or self.age() >= self.interval:
+                    self.probe()
+            return
+
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+
+            # nothing of our own yet: probe inline, a result inherited over
+            # fork() is replaced by the thread right away
+            fresh = self._last is None
+            if fresh:
+                self.probe()
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._stop, fresh), name="health-prober", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self, stop, wait_first):
+        if wait_first:
+            stop.wait(self.interval)
+        while not stop.is_set():
+            self.probe()
+            stop.wait(self.interval)
+
+    def _check_database(self, engine):
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return "ok"
+        except Exception as e:
+            logger.warning("health: database check failed: %s", e)
+            return "error"
+
+    def _check_redis(self):
+        if self.redis is None:
+            return "disabled"
+        try:
+            self.redis.ping()
+            return "ok"
+        except redis.RedisError as e:
+            logger.warning("health: redis check failed: %s", e)
+            return "error"
+
+    def probe(self):
+        with self.app.app_context():
+            services = {}
+            pools = {}
+
+            for key, engine in db.engines.items():
+                name = "database" if key is None else key
+                services[name] = self._check_database(engine)
+                pools[name] = _pool_stats(engine)
+
+            services["redis"] = self._check_redis()
+
+        result = {"services": services, "pools": pools}
+        self._last = (result, time.monotonic(), datetime.now(timezone.utc))
+        return result
+
+    def age(self):
+        last = self._last
+        if last is None:
+            return None
+        return time.monotonic() - last[1]
+
+    def current(self):
+        self._ensure_prober()
+
+        result, checked_at, checked_at_wall = self._last
+        age = time.monotonic() - checked_at
+        services = result["services"]
+        healthy = all(status in ("ok", "disabled") for status in services.values())
+
+        return {
+            "status": "healthy" if healthy else "degraded",
+            "services": services,
+            "pools": result["pools"],
+            "checked_at": checked_at_wall.isoformat(timespec="seconds"),
+            "age_seconds": round(age, 3),
+            "stale": age > self.max_age
+        }
+
+    # ready = the primary database answered recently; Redis is optional,
+    # everything using it falls back without it
+    def is_ready(self, report):
+        return not report["stale"] and report["services"].get("database") == "ok"
+
+
+health = HealthMonitor()
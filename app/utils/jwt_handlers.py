@@ -1,14 +1,12 @@
 from app.utils.responses import error_response
-from app.models import TokenBlockList
-from app.extensions import db, jwt
+from app.utils.token_blocklist import blocklist
+from app.extensions import jwt
 
 def register_jwt_handlers(app):
     
     @jwt.token_in_blocklist_loader
     def check_in_token_revoked(jwt_header, jwt_payload):
-        jti = jwt_payload["jti"]
-        token = db.session.query(TokenBlockList.id).filter_by(jti=jti).scalar()
-        return token is not None
+        return blocklist.is_revoked(jwt_payload["jti"])
 
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
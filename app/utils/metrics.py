@@ -0,0 +1,284 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from flask import g, request
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+KNOWN_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
+
+# name -> (type, help, buckets)
+METRICS = {
+    "http_requests_total": (
+        "counter", "Requests handled, by endpoint, method and status.", None
+    ),
+    "http_request_duration_seconds": (
+        "histogram", "Request latency in seconds.", LATENCY_BUCKETS
+    ),
+    "http_response_size_bytes": (
+        "histogram", "Response body size in bytes.", SIZE_BUCKETS
+    ),
+    "http_requests_in_flight": (
+        "gauge", "Requests currently being handled.", None
+    ),
+}
+
+
+# Metric values of one process. Label sets are capped per metric; anything
+# past METRICS_MAX_SERIES is folded into endpoint="other".
+class Registry:
+    def __init__(self, max_series=500):
+        self.max_series = max_series
+        self.values = {}
+        self._series = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _key(self, name, labels):
+        key = (name, tuple(sorted(labels.items())))
+        if key not in self.values and self._series[name] >= self.max_series:
+            labels = dict(labels, endpoint="other")
+            key = (name, tuple(sorted(labels.items())))
+        return key
+
+    def inc(self, name, labels, amount=1):
+        with self._lock:
+            key = self._key(name, labels)
+            if key not in self.values:
+                self._series[name] += 1
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+
+        with self._lock:
+            key = self._key(name, labels)
+            if key not in self.values:
+                self._series[name] += 1
+                # per-bucket counts, then sum and count
+                self.values[key] = [0] * len(buckets) + [0.0, 0]
+
+            entry = self.values[key]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    entry[i] += 1
+                    break
+            entry[-2] += value
+            entry[-1] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                [name, list(labels), value if not isinstance(value, list) else list(value)]
+                for (name, labels), value in self.values.items()
+            ]
+
+
+def _merge(snapshots):
+    merged = {}
+
+    for snapshot in snapshots:
+        for name, labels, value in snapshot:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            if key not in merged:
+                merged[key] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, list):
+                merged[key] = [a + b for a, b in zip(merged[key], value)]
+            else:
+                merged[key] += value
+
+    return merged
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + (extra or [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def render(merged):
+    lines = []
+
+    for name, (kind, help_text, buckets) in METRICS.items():
+        series = sorted((labels, value) for (n, labels), value in merged.items() if n == name)
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+        for labels, value in series:
+            if kind != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+                continue
+
+            cumulative = 0
+            for bound, count in zip(buckets, value):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {value[-1]}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {value[-2]}")
+            lines.append(f"{name}_count{_format_labels(labels)} {value[-1]}")
+
+    return "\n".join(lines) + "\n"
+
+
+# Request instrumentation exposed in the Prometheus text format.
+#
+# Each process counts into its own Registry. With METRICS_MULTIPROC_DIR set
+# (one directory shared by all gunicorn workers), every worker also writes
+# its values to metrics_<pid>.json at most every METRICS_FLUSH_INTERVAL
+# seconds, and /metrics sums the files of all workers. Counters and
+# histograms of exited workers are kept so totals never go backwards; their
+# in-flight gauges are dropped.
+class RequestMetrics:
+    def __init__(self, app=None):
+        self.registry = Registry()
+        self.multiproc_dir = None
+        self.flush_interval = 1.0
+        self._flushed_at = 0.0
+        self._flush_lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("METRICS_ENABLED", True)
+        app.config.setdefault("METRICS_MULTIPROC_DIR", None)
+        app.config.setdefault("METRICS_FLUSH_INTERVAL", 1.0)
+        app.config.setdefault("METRICS_MAX_SERIES", 500)
+
+        self.registry = Registry(app.config["METRICS_MAX_SERIES"])
+        self.multiproc_dir = app.config["METRICS_MULTIPROC_DIR"]
+        self.flush_interval = app.config["METRICS_FLUSH_INTERVAL"]
+        app.extensions["metrics"] = self
+
+        if not app.config["METRICS_ENABLED"]:
+            return
+
+        if self.multiproc_dir:
+            os.makedirs(self.multiproc_dir, exist_ok=True)
+
+        # first, so the timing also covers the other before_request hooks
+        app.before_request_funcs.setdefault(None, []).insert(0, self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    @staticmethod
+    def _labels():
+        rule = request.url_rule
+        method = request.method if request.method in KNOWN_METHODS else "other"
+        return {
+            "endpoint": rule.endpoint if rule is not None else "unmatched",
+            "method": method
+        }
+
+    def _before_request(self):
+        g.metrics_start = time.perf_counter()
+        g.metrics_labels = self._labels()
+        self.registry.inc("http_requests_in_flight", g.metrics_labels)
+
+    def _after_request(self, response):
+        labels = g.get("metrics_labels") or self._labels()
+        start = g.get("metrics_start")
+
+        self.registry.inc("http_requests_total", dict(labels, status=str(response.status_code)))
+        if start is not None:
+            self.registry.observe("http_request_duration_seconds", labels, time.perf_counter() - start)
+        if not response.is_streamed:
+            self.registry.observe("http_response_size_bytes", labels, response.calculate_content_length() or 0)
+
+        self._maybe_flush()
+        return response
+
+    def _teardown_request(self, exc):
+        labels = g.pop("metrics_labels", None)
+        if labels is not None:
+            self.registry.inc("http_requests_in_flight", labels, -1)
+
+    def _path(self, pid):
+        return os.path.join(self.multiproc_dir, f"metrics_{pid}.json")
+
+    def _maybe_flush(self, force=False):
+        if not self.multiproc_dir:
+            return
+
+        now = time.monotonic()
+        if not force and now - self._flushed_at < self.flush_interval:
+            return
+
+        # one flush per process at a time; unless forced, leave it to the
+        # thread that is already writing
+        if not self._flush_lock.acquire(blocking=force):
+            return
+
+        tmp = None
+        try:
+            self._flushed_at = now
+            path = self._path(os.getpid())
+            # a unique temp file, so a stray writer can't replace ours
+            fd, tmp = tempfile.mkstemp(dir=self.multiproc_dir, prefix=f"metrics_{os.getpid()}.", suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.registry.snapshot(), f)
+            os.replace(tmp, path)
+            tmp = None
+        except Exception:
+            # exporting metrics must never fail the request
+            logger.exception("metrics flush failed")
+        finally:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+            self._flush_lock.release()
+
+    def collect(self):
+        own = self.registry.snapshot()
+        if not self.multiproc_dir:
+            return render(_merge([own]))
+
+        snapshots = [own]
+        for filename in os.listdir(self.multiproc_dir):
+            if not (filename.startswith("metrics_") and filename.endswith(".json")):
+                continue
+
+            try:
+                pid = int(filename[len("metrics_"):-len(".json")])
+            except ValueError:
+                continue
+            if pid == os.getpid():
+                continue
+
+            try:
+                with open(os.path.join(self.multiproc_dir, filename)) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            if not _pid_alive(pid):
+                snapshot = [s for s in snapshot if METRICS[s[0]][0] != "gauge"]
+            snapshots.append(snapshot)
+
+        return render(_merge(snapshots))
+
+
+metrics = RequestMetrics()
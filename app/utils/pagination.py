@@ -0,0 +1,100 @@
+import base64
+import json
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import and_, or_
+
+
+def clamp_per_page(per_page):
+    max_per_page = current_app.config["MAX_PER_PAGE"]
+    return max(1, min(per_page, max_per_page))
+
+
+# Cursors are opaque to clients: base64 of the sort key of the last row
+def _encode(values):
+    payload = json.dumps(values)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(created_at, row_id):
+    return _encode([created_at.isoformat(), row_id])
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, row_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_score_cursor(score, row_id):
+    return _encode([score, row_id])
+
+
+def decode_score_cursor(cursor):
+    try:
+        score, row_id = _decode(cursor)
+        return float(score), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def decode_id_cursor(cursor):
+    try:
+        (row_id,) = _decode(cursor)
+        return int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+# Keyset pagination over (created_at, id). Fetches one extra row to know if
+# there is a next page, so no COUNT query is needed.
+def keyset_page(query, created_col, id_col, cursor, per_page, descending=True):
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+
+        if descending:
+            query = query.filter(or_(
+                created_col < created_at,
+                and_(created_col == created_at, id_col < row_id)
+            ))
+        else:
+            query = query.filter(or_(
+                created_col > created_at,
+                and_(created_col == created_at, id_col > row_id)
+            ))
+
+    if descending:
+        query = query.order_by(created_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(created_col.asc(), id_col.asc())
+
+    rows = query.limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return rows, next_cursor
+
+
+# Keyset pagination over id alone, ascending
+def keyset_page_by_id(query, id_col, cursor, per_page):
+    if cursor:
+        query = query.filter(id_col > decode_id_cursor(cursor))
+
+    rows = query.order_by(id_col.asc()).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = _encode([rows[-1].id])
+
+    return rows, next_cursor
@@ -0,0 +1,131 @@
+import time
+from collections import Counter
+from flask import g, request, current_app, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class RequestQueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+
+def _route():
+    if not has_request_context():
+        return "-"
+    rule = request.url_rule
+    return f"{request.method} {rule.rule if rule is not None else request.path}"
+
+
+def _shorten(statement, limit=300):
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+# Per-request SQL accounting through engine events.
+#
+# Every statement run inside a request adds to a RequestQueryStats on g:
+# query count, total DB time and how often each statement text was seen.
+# With SERVER_TIMING_ENABLED the totals go out as a Server-Timing header.
+# Statements slower than QUERY_SLOW_MS are logged with their route, and with
+# QUERY_N_PLUS_ONE_DETECTION a statement text repeated at least
+# QUERY_N_PLUS_ONE_THRESHOLD times in one request is logged as an N+1
+# candidate; lazy loads in a loop show up as the same SELECT with
+# different parameters.
+#
+# Queries run while a streamed body is being sent happen after the headers
+# are out, so they are not part of the header or the N+1 check.
+class QueryStats:
+    def __init__(self, app=None):
+        self.slow_ms = None
+        self.n_plus_one_threshold = None
+        self._listening = False
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("QUERY_STATS_ENABLED", True)
+        app.config.setdefault("SERVER_TIMING_ENABLED", False)
+        app.config.setdefault("QUERY_SLOW_MS", 250)
+        app.config.setdefault("QUERY_N_PLUS_ONE_DETECTION", False)
+        app.config.setdefault("QUERY_N_PLUS_ONE_THRESHOLD", 3)
+
+        app.extensions["query_stats"] = self
+
+        if not app.config["QUERY_STATS_ENABLED"]:
+            return
+
+        self.slow_ms = app.config["QUERY_SLOW_MS"]
+        if app.config["QUERY_N_PLUS_ONE_DETECTION"]:
+            self.n_plus_one_threshold = app.config["QUERY_N_PLUS_ONE_THRESHOLD"]
+        else:
+            self.n_plus_one_threshold = None
+
+        # on the Engine class, because Flask-SQLAlchemy creates its engines
+        # lazily and one listener is enough for all of them
+        if not self._listening:
+            event.listen(Engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", self._after_cursor_execute)
+            self._listening = True
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    @staticmethod
+    def current():
+        if not has_request_context():
+            return None
+        return g.get("query_stats")
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+
+        stats = self.current()
+        if stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+            stats.statements[statement] += 1
+
+        if self.slow_ms is not None and elapsed * 1000 >= self.slow_ms:
+            logger.warning(
+                "slow query %.1fms on %s: %s", elapsed * 1000, _route(), _shorten(statement)
+            )
+
+    def _before_request(self):
+        g.query_stats = RequestQueryStats()
+
+    def _after_request(self, response):
+        stats = g.get("query_stats")
+        if stats is None:
+            return response
+
+        if self.n_plus_one_threshold:
+            for statement, times in stats.statements.items():
+                if times >= self.n_plus_one_threshold:
+                    logger.warning(
+                        "possible N+1 on %s: statement ran %d times: %s",
+                        _route(), times, _shorten(statement)
+                    )
+
+        if current_app.config["SERVER_TIMING_ENABLED"]:
+            response.headers.add(
+                "Server-Timing",
+                f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'
+            )
+
+        return response
+
+
+query_stats = QueryStats()
@@ -0,0 +1,203 @@
+import os
+import threading
+import time
+import redis
+from urllib.parse import urlparse, parse_qs
+from limits.storage import Storage
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class _Window:
+    __slots__ = ("expires_at", "expiry", "base", "pending", "touched")
+
+    def __init__(self, expiry, now):
+        self.expiry = expiry
+        self.expires_at = now + expiry
+        # count in Redis as of the last sync, and hits not sent there yet
+        self.base = 0
+        self.pending = 0
+        self.touched = True
+
+    @property
+    def value(self):
+        return self.base + self.pending
+
+
+# Fixed-window rate limit storage that counts locally and syncs to Redis.
+#
+#     RATELIMIT_STORAGE_URI = "hybrid+redis://redis:6379/0"
+#
+# Every worker keeps its own counters and a background thread sends the
+# accumulated deltas to Redis every sync_interval seconds in one pipeline
+# (INCRBY, EXPIRE NX, PTTL per key), reading back the global totals. A key
+# whose unsynced hits reach max_pending is synced right away, so with W
+# workers a limit can be overshot by at most (W - 1) * max_pending hits.
+#
+# While Redis is unreachable the storage keeps counting locally (per-worker
+# limits, never an error) and pushes the deltas of still-open windows once
+# Redis is back. Only the fixed-window strategy is supported.
+class HybridRedisStorage(Storage):
+    STORAGE_SCHEME = ["hybrid+redis", "hybrid+rediss"]
+
+    def __init__(self, uri, wrap_exceptions=False, sync_interval=0.1, max_pending=10, **options):
+        parsed = urlparse(uri)
+        query = parse_qs(parsed.query)
+        self.sync_interval = float(query.pop("sync_interval", [sync_interval])[0])
+        self.max_pending = int(query.pop("max_pending", [max_pending])[0])
+
+        redis_uri = parsed._replace(scheme=parsed.scheme.split("+", 1)[1], query="").geturl()
+        self.client = redis.from_url(
+            redis_uri,
+            socket_timeout=options.pop("socket_timeout", 0.2),
+            socket_connect_timeout=options.pop("socket_connect_timeout", 0.2),
+            **options
+        )
+
+        self.windows = {}
+        self.degraded = False
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+
+        super().__init__(uri, wrap_exceptions=wrap_exceptions)
+
+    @property
+    def base_exceptions(self):
+        return redis.RedisError
+
+    def _ensure_syncer(self):
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._stop,), name="ratelimit-sync", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self, stop):
+        while not stop.wait(self.sync_interval):
+            self.sync()
+
+    # ends this process's sync thread; the next hit starts a new one
+    def stop(self):
+        with self._lock:
+            self._stop.set()
+            self._thread = None
+            self._stop = threading.Event()
+
+    def _window(self, key, now):
+        window = self.windows.get(key)
+        if window is None or window.expires_at <= now:
+            return None
+        return window
+
+    def incr(self, key, expiry, amount=1):
+        self._ensure_syncer()
+        now = time.time()
+
+        with self._lock:
+            window = self._window(key, now)
+            if window is None:
+                window = self.windows[key] = _Window(expiry, now)
+            window.pending += amount
+            window.touched = True
+            value = window.value
+            flush = window.pending >= self.max_pending and not self.degraded
+
+        if flush:
+            self.sync([key])
+            with self._lock:
+                window = self.windows.get(key)
+                if window is not None:
+                    value = max(value, window.value)
+
+        return value
+
+    def get(self, key):
+        with self._lock:
+            window = self._window(key, time.time())
+            return window.value if window is not None else 0
+
+    def get_expiry(self, key):
+        with self._lock:
+            window = self._window(key, time.time())
+            return window.expires_at if window is not None else time.time()
+
+    # Sends pending deltas of the given keys (default: every key touched
+    # since the last sync) and adopts the totals and TTLs Redis returns.
+    def sync(self, keys=None):
+        now = time.time()
+
+        with self._lock:
+            for key in [k for k, w in self.windows.items() if w.expires_at <= now]:
+                del self.windows[key]
+
+            if keys is None:
+                keys = [k for k, w in self.windows.items() if w.touched or w.pending]
+            batch = []
+            for key in keys:
+                window = self.windows.get(key)
+                if window is None:
+                    continue
+                batch.append((key, window, window.pending))
+                window.pending = 0
+                window.touched = False
+
+        if not batch:
+            return
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, window, delta in batch:
+                pipe.incrby(key, delta)
+                pipe.expire(key, window.expiry, nx=True)
+                pipe.pttl(key)
+            replies = pipe.execute()
+        except redis.RedisError as e:
+            with self._lock:
+                for key, window, delta in batch:
+                    window.pending += delta
+            if not self.degraded:
+                logger.warning("rate limit sync failed, counting locally: %s", e)
+                self.degraded = True
+            return
+
+        if self.degraded:
+            logger.info("rate limit sync recovered")
+            self.degraded = False
+
+        with self._lock:
+            for i, (key, window, delta) in enumerate(batch):
+                total, _, ttl = replies[i * 3:i * 3 + 3]
+                window.base = total
+                if ttl and ttl > 0:
+                    window.expires_at = now + ttl / 1000
+
+    def check(self):
+        # counting locally is a working state, not a storage failure
+        return True
+
+    def reset(self):
+        with self._lock:
+            keys = list(self.windows)
+            self.windows.clear()
+        if keys:
+            try:
+                self.client.delete(*keys)
+            except redis.RedisError as e:
+                logger.warning("rate limit reset failed: %s", e)
+        return len(keys)
+
+    def clear(self, key):
+        with self._lock:
+            self.windows.pop(key, None)
+        try:
+            self.client.delete(key)
+        except redis.RedisError as e:
+            logger.warning("rate limit clear failed: %s", e)
@@ -0,0 +1,113 @@
+import random
+import jwt as pyjwt
+from flask import g, request, has_request_context
+from flask_sqlalchemy.session import Session
+from app.utils.cache import MemoryCache, RedisCache
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _bind_key(index):
+    return f"replica_{index}"
+
+
+# Session that sends SELECTs of GET requests to a replica engine. Flushes,
+# DML and textual statements always use the primary (the default bind).
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and clause is not None
+            and clause.is_select
+            and has_request_context()
+            and g.get("read_from_replica")
+        ):
+            return replicas.pick(self._db.engines)
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+# The identity of the token is only a routing hint here, so the signature is
+# not checked; views still verify the token as before
+def _token_identity():
+    header = request.headers.get("Authorization", "")
+    if not header.startswith("Bearer "):
+        return None
+    try:
+        return pyjwt.decode(header[7:], options={"verify_signature": False}).get("sub")
+    except pyjwt.PyJWTError:
+        return None
+
+
+# Read replicas through SQLAlchemy binds.
+#
+# Each URI in SQLALCHEMY_REPLICA_URIS becomes a bind (replica_0, replica_1,
+# ...) and the SELECTs of GET/HEAD requests go to a random one of them.
+# After a user's successful write, that user's reads stay on the primary for
+# READ_YOUR_WRITES_SECONDS so they see their own change despite replication
+# lag. The pins live in REPLICA_PIN_REDIS_URL when set and in a per-worker
+# LRU otherwise; a per-worker pin only covers requests that land on the
+# same worker.
+class ReplicaRouter:
+    def __init__(self, app=None):
+        self.keys = []
+        self.pin_seconds = 5
+        self.pins = MemoryCache()
+
+        if app is not None:
+            self.init_app(app)
+
+    # must run before db.init_app, which creates the engines of all binds
+    def init_app(self, app):
+        app.config.setdefault("SQLALCHEMY_REPLICA_URIS", [])
+        app.config.setdefault("READ_YOUR_WRITES_SECONDS", 5)
+        app.config.setdefault("REPLICA_PIN_REDIS_URL", None)
+
+        uris = app.config["SQLALCHEMY_REPLICA_URIS"]
+        self.keys = [_bind_key(i) for i in range(len(uris))]
+        self.pin_seconds = app.config["READ_YOUR_WRITES_SECONDS"]
+
+        if app.config["REPLICA_PIN_REDIS_URL"]:
+            self.pins = RedisCache(app.config["REPLICA_PIN_REDIS_URL"], prefix="replica-pin:")
+        else:
+            self.pins = MemoryCache(app.config.get("CACHE_MAX_ENTRIES", 1024))
+
+        app.extensions["replicas"] = self
+
+        if not uris:
+            return
+
+        binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+        binds.update({key: uri for key, uri in zip(self.keys, uris)})
+        app.config["SQLALCHEMY_BINDS"] = binds
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def pick(self, engines):
+        return engines[random.choice(self.keys)]
+
+    def pin(self, identity):
+        self.pins.set(f"user:{identity}", 1, self.pin_seconds)
+
+    def is_pinned(self, identity):
+        return self.pins.get_many([f"user:{identity}"])[0] is not None
+
+    def _before_request(self):
+        if request.method not in SAFE_METHODS:
+            g.read_from_replica = False
+            return
+
+        identity = _token_identity()
+        g.read_from_replica = identity is None or not self.is_pinned(identity)
+
+    def _after_request(self, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            identity = _token_identity()
+            if identity is not None:
+                self.pin(identity)
+        return response
+
+
+replicas = ReplicaRouter()
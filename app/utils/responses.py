@@ -7,6 +7,17 @@ def success_response(message=None, data=None, status_code=200):
         "data": data
     }), status_code
 
+# List data as {"columns": [...], "rows": [[...], ...]} straight from the
+# Row tuples of a column select, without building a dict per row
+def rows_response(rows, columns, message=None, extra=None, status_code=200):
+    data = {
+        "columns": list(columns),
+        "rows": [tuple(row) for row in rows]
+    }
+    if extra:
+        data.update(extra)
+    return success_response(message, data, status_code)
+
 def error_response(message="Error", status_code=400):
     return jsonify({
         "success": False,
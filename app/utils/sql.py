@@ -0,0 +1,10 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from app.extensions import db
+
+
+# INSERT ... ON CONFLICT DO NOTHING for Postgres and SQLite. Without
+# index_elements any unique constraint counts as a conflict. Add
+# .returning(...) to tell inserted rows from skipped ones.
+def insert_ignoring_conflicts(model, index_elements=None):
+    module = postgresql if db.engine.dialect.name == "postgresql" else sqlite
+    return module.insert(model).on_conflict_do_nothing(index_elements=index_elements)
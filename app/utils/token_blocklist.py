@@ -0,0 +1,176 @@
+import threading
+import time
+import redis
+from datetime import datetime
+from flask import current_app
+from app.extensions import db
+from app.models import TokenBlockList
+from app.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# longest wait between retries while the store is unreachable
+RETRY_MAX_SECONDS = 30
+
+
+# Revoked JTIs in a Redis sorted set scored by token expiry, so expired
+# entries can be trimmed by score and no JTI outlives its token.
+class RedisBlocklistStore:
+    key = "jwt:revoked"
+
+    def __init__(self, url):
+        self._client = redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    def add(self, jti, expires_at):
+        pipe = self._client.pipeline()
+        pipe.zadd(self.key, {jti: expires_at})
+        pipe.zremrangebyscore(self.key, "-inf", time.time())
+        pipe.execute()
+
+    def active(self, now):
+        entries = self._client.zrangebyscore(self.key, now, "+inf", withscores=True)
+        return {jti.decode(): expires_at for jti, expires_at in entries}
+
+    def is_empty(self):
+        return not self._client.exists(self.key)
+
+
+# Process-local stand-in for Redis: only correct with a single worker
+class MemoryBlocklistStore:
+    def __init__(self):
+        self._entries = {}
+
+    def add(self, jti, expires_at):
+        self._entries[jti] = expires_at
+
+    def active(self, now):
+        self._entries = {j: e for j, e in self._entries.items() if e > now}
+        return dict(self._entries)
+
+    def is_empty(self):
+        return not self._entries
+
+
+# Per-worker copy of the revoked JTIs.
+#
+# With a shared store (JWT_BLOCKLIST_STORE=redis) each worker re-reads the
+# active JTIs at most every JWT_BLOCKLIST_SYNC_SECONDS and answers from memory
+# in between, so checking a token that is not revoked costs no DB query.
+# A worker can therefore miss a logout made on another worker for up to one
+# sync interval. If the store is unreachable, or JWT_BLOCKLIST_STORE=database,
+# lookups fall back to the token_block_list table; the store is retried
+# after one sync interval (at least a second), doubling on each failure up
+# to RETRY_MAX_SECONDS, so an outage doesn't cost every request a timeout.
+class TokenBlocklist:
+    def __init__(self, app=None):
+        self.store = None
+        self.sync_interval = 1.0
+        self._revoked = {}
+        self._synced_at = None
+        self._retry_at = None
+        self._retry_delay = None
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("JWT_BLOCKLIST_STORE", "database")
+        app.config.setdefault("JWT_BLOCKLIST_REDIS_URL", None)
+        app.config.setdefault("JWT_BLOCKLIST_SYNC_SECONDS", 1.0)
+
+        store = app.config["JWT_BLOCKLIST_STORE"]
+
+        if store == "redis" and app.config["JWT_BLOCKLIST_REDIS_URL"]:
+            self.store = RedisBlocklistStore(app.config["JWT_BLOCKLIST_REDIS_URL"])
+        elif store == "memory":
+            self.store = MemoryBlocklistStore()
+        else:
+            self.store = None
+
+        self.sync_interval = app.config["JWT_BLOCKLIST_SYNC_SECONDS"]
+        self._revoked = {}
+        self._synced_at = None
+        self._retry_at = None
+        self._retry_delay = None
+
+        app.extensions["token_blocklist"] = self
+
+    def revoke(self, jti, expires_at):
+        self._revoked[jti] = expires_at
+
+        if self.store is not None:
+            try:
+                self.store.add(jti, expires_at)
+            except Exception as e:
+                logger.warning("blocklist store add failed: %s", e)
+
+    def is_revoked(self, jti):
+        if jti in self._revoked:
+            return True
+
+        if self.store is not None and self._sync():
+            return jti in self._revoked
+
+        return self._is_revoked_in_database(jti)
+
+    def _sync(self):
+        now = time.time()
+
+        if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+            return True
+        if self._retry_at is not None and now < self._retry_at:
+            return False
+
+        with self._lock:
+            # another thread may have synced or failed while we waited
+            if self._synced_at is not None and now - self._synced_at < self.sync_interval:
+                return True
+            if self._retry_at is not None and now < self._retry_at:
+                return False
+
+            try:
+                if self._synced_at is None and self.store.is_empty():
+                    self._seed_store(now)
+                active = self.store.active(now)
+            except Exception as e:
+                self._retry_delay = min(
+                    self._retry_delay * 2 if self._retry_delay else max(self.sync_interval, 1.0),
+                    RETRY_MAX_SECONDS
+                )
+                self._retry_at = time.time() + self._retry_delay
+                logger.warning("blocklist sync failed, retrying in %.0fs: %s", self._retry_delay, e)
+                self._synced_at = None
+                return False
+
+            self._retry_at = None
+            self._retry_delay = None
+
+            # keep local revocations whose write to the store may have failed
+            for jti, expires_at in self._revoked.items():
+                if expires_at > now:
+                    active.setdefault(jti, expires_at)
+
+            self._revoked = active
+            self._synced_at = now
+            return True
+
+    # An empty store (new or flushed Redis) is refilled from the table, which
+    # stays the durable record of revocations
+    def _seed_store(self, now):
+        lifetime = current_app.config["JWT_ACCESS_TOKEN_EXPIRES"]
+        rows = db.session.execute(
+            db.select(TokenBlockList.jti, TokenBlockList.created_at)
+            .where(TokenBlockList.created_at > datetime.utcnow() - lifetime)
+        ).all()
+
+        for jti, created_at in rows:
+            expires_at = (created_at + lifetime - datetime.utcnow()).total_seconds() + now
+            self.store.add(jti, expires_at)
+
+    def _is_revoked_in_database(self, jti):
+        token = db.session.query(TokenBlockList.id).filter_by(jti=jti).scalar()
+        return token is not None
+
+
+blocklist = TokenBlocklist()
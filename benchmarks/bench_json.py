@@ -0,0 +1,88 @@
+"""Encode a 100-post page with each JSON path.
+
+    python benchmarks/bench_json.py --posts 100 --number 2000
+"""
+import argparse
+import os
+import sys
+import timeit
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+
+Row = namedtuple("Row", [
+    "id", "title", "excerpt", "created_at", "like_count", "comment_count",
+    "author_id", "username", "profile_pic"
+])
+
+
+def make_rows(count):
+    now = datetime(2026, 1, 1)
+    return [
+        Row(
+            i, f"Post title {i}", "Lorem ipsum dolor sit amet " * 7,
+            now - timedelta(minutes=i), i * 3, i % 17,
+            i % 50, f"user{i % 50}", f"https://cdn.example.com/u/{i % 50}.png"
+        )
+        for i in range(count)
+    ]
+
+
+def page(items):
+    return {"success": True, "message": "Feed fetched", "data": {"items": items}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    app = Flask("bench")
+    rows = make_rows(args.posts)
+
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    def as_dicts():
+        return page([row._asdict() for row in rows])
+
+    def as_rows():
+        return page({"columns": list(Row._fields), "rows": [tuple(row) for row in rows]})
+
+    orjson = json_provider.orjson
+
+    def measure(fn, use_orjson):
+        json_provider.orjson = orjson if use_orjson else None
+        try:
+            return min(timeit.repeat(fn, number=args.number, repeat=3))
+        finally:
+            json_provider.orjson = orjson
+
+    cases = [
+        ("flask default (stdlib, sorted keys)", lambda: stdlib.dumps(as_dicts()), False),
+        ("fast provider, stdlib fallback", lambda: fast.dumps(as_dicts()), False),
+    ]
+    if orjson is not None:
+        cases += [
+            ("fast provider, orjson", lambda: fast.dumps(as_dicts()), True),
+            ("fast provider, orjson rows", lambda: fast.dumps(as_rows()), True),
+        ]
+    else:
+        print("orjson is not installed; only the stdlib paths are measured")
+
+    baseline = None
+    for label, fn, use_orjson in cases:
+        elapsed = measure(fn, use_orjson)
+        baseline = baseline or elapsed
+        per_page = elapsed / args.number * 1e6
+        print(f"{label:<38} {per_page:9.1f} us/page   {baseline / elapsed:5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Login throughput with bcrypt hashed inline vs. in the hashing pool.
+
+    python benchmarks/bench_login.py --logins 64 --concurrency 16 --workers 2
+
+Every login checks a bcrypt hash at BCRYPT_LOG_ROUNDS. While the logins run,
+one extra thread keeps reading GET /posts so the effect of hashing on reads
+shows up too.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app
+from app.extensions import db
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(label, workers, args, db_path):
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{db_path}",
+        "JWT_SECRET_KEY": "bench-secret-key-with-at-least-32-characters",
+        "RATELIMIT_ENABLED": False,
+        "CACHE_TYPE": "null",
+        "BCRYPT_LOG_ROUNDS": args.rounds,
+        "HASHING_POOL_WORKERS": workers,
+        "HASHING_POOL_MAX_PENDING": args.logins,
+    })
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+    app.test_client().post("/register", json={
+        "username": "bench",
+        "email": "bench@example.com",
+        "password": "bench-password"
+    })
+
+    def login(_):
+        start = time.perf_counter()
+        res = app.test_client().post("/login", json={
+            "username": "bench",
+            "password": "bench-password"
+        })
+        assert res.status_code == 200, res.json
+        return time.perf_counter() - start
+
+    read_latencies = []
+    done = threading.Event()
+
+    def reader():
+        client = app.test_client()
+        while not done.is_set():
+            start = time.perf_counter()
+            client.get("/posts")
+            read_latencies.append(time.perf_counter() - start)
+
+    read_thread = threading.Thread(target=reader)
+    read_thread.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        latencies = list(pool.map(login, range(args.logins)))
+    elapsed = time.perf_counter() - start
+
+    done.set()
+    read_thread.join()
+
+    print(
+        f"{label:<14} {args.logins / elapsed:8.1f} logins/s"
+        f"   login p50 {statistics.median(latencies) * 1000:7.1f} ms"
+        f"   login p95 {percentile(latencies, 95) * 1000:7.1f} ms"
+        f"   read p95 {percentile(read_latencies, 95) * 1000:7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--rounds", type=int, default=12)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        run("inline", 0, args, db_path)
+        run(f"pool ({args.workers})", args.workers, args, db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Rate limit hits with the plain Redis storage vs. the hybrid storage.
+
+    python benchmarks/bench_rate_limit.py --redis-url redis://localhost:6379/15 \\
+        --workers 4 --threads 8 --hits 20000
+
+Each simulated worker gets its own storage instance, as gunicorn workers
+would, and --threads threads per worker call FixedWindowRateLimiter.hit()
+on a handful of keys. Reported per storage: hits/s, p50/p99 latency of one
+hit, and for a limit of --limit hits on one shared key how many hits were
+accepted (the hybrid storage may overshoot by up to
+(workers - 1) * max_pending).
+
+Needs a Redis server; the given database is flushed.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import redis
+from limits import RateLimitItemPerHour
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+from app.utils import rate_limit_storage  # registers hybrid+redis://
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def throughput(uri, args):
+    limiters = [FixedWindowRateLimiter(storage_from_string(uri)) for _ in range(args.workers)]
+    item = RateLimitItemPerHour(10 ** 9)
+
+    def run(index):
+        limiter = limiters[index % args.workers]
+        latencies = []
+        for i in range(args.hits // (args.workers * args.threads)):
+            start = time.perf_counter()
+            limiter.hit(item, "bench", str(i % args.keys))
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers * args.threads) as pool:
+        latencies = [l for chunk in pool.map(run, range(args.workers * args.threads)) for l in chunk]
+    elapsed = time.perf_counter() - start
+
+    return len(latencies) / elapsed, statistics.median(latencies), percentile(latencies, 99)
+
+
+def accuracy(uri, args):
+    limiters = [FixedWindowRateLimiter(storage_from_string(uri)) for _ in range(args.workers)]
+    item = RateLimitItemPerHour(args.limit)
+
+    def run(index):
+        limiter = limiters[index % args.workers]
+        return sum(limiter.hit(item, "accuracy") for _ in range(args.limit))
+
+    with ThreadPoolExecutor(max_workers=args.workers * args.threads) as pool:
+        return sum(pool.map(run, range(args.workers * args.threads)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--hits", type=int, default=20000)
+    parser.add_argument("--keys", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--sync-interval", type=float, default=0.1)
+    parser.add_argument("--max-pending", type=int, default=10)
+    args = parser.parse_args()
+
+    client = redis.from_url(args.redis_url)
+    hybrid = (
+        f"hybrid+{args.redis_url}?sync_interval={args.sync_interval}"
+        f"&max_pending={args.max_pending}"
+    )
+
+    for label, uri in (("redis", args.redis_url), ("hybrid", hybrid)):
+        client.flushdb()
+        rate, p50, p99 = throughput(uri, args)
+        client.flushdb()
+        accepted = accuracy(uri, args)
+        print(
+            f"{label:<8} {rate:10.0f} hits/s   p50 {p50 * 1e6:8.1f} us   p99 {p99 * 1e6:8.1f} us"
+            f"   accepted {accepted} of limit {args.limit}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Cold import and create_app() time, with and without API docs.
+
+    python benchmarks/bench_startup.py --runs 10
+
+Every run is a fresh interpreter, so "import" is the real cold import of the
+app package and its dependencies. "create_app" is the first call in that
+process and "create_app (warm)" the mean of further calls, which is what the
+test suite pays per test.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app({overrides})
+created = time.perf_counter()
+for _ in range(5):
+    create_app({overrides})
+warm = (time.perf_counter() - created) / 5
+print(json.dumps({{
+    "import": imported - start,
+    "create_app": created - imported,
+    "create_app (warm)": warm,
+    "flasgger loaded": "flasgger" in sys.modules,
+}}))
+"""
+
+
+def measure(overrides, runs):
+    env = dict(os.environ, JWT_SECRET_KEY=os.getenv("JWT_SECRET_KEY", "bench-secret-key-with-at-least-32-characters"))
+    code = PROBE.format(root=ROOT, overrides=overrides)
+
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], env=env, cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    cases = [
+        ("docs enabled", {"SWAGGER_ENABLED": True}),
+        ("docs disabled", {"SWAGGER_ENABLED": False}),
+    ]
+
+    for label, overrides in cases:
+        results = measure(overrides, args.runs)
+        timings = "   ".join(
+            f"{name} {statistics.median(r[name] for r in results) * 1000:7.1f} ms"
+            for name in ("import", "create_app", "create_app (warm)")
+        )
+        print(f"{label:<14} {timings}   flasgger loaded: {results[0]['flasgger loaded']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Seed a benchmark database with users, posts, comments and likes.
+
+    python benchmarks/seed.py --database-uri sqlite:////tmp/bench.db --reset \\
+        --users 1000 --posts 10000 --comments 10 --likes 20
+
+Rows are generated from --seed, so the same arguments always give the same
+dataset. Everything is written with multi-row INSERTs and the denormalized
+like/comment counters are filled in directly, so seeding 10k posts takes
+seconds, not minutes.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import create_app
+from app.extensions import db
+from app.models import User, Post, Comment, Like
+from app.utils.hashing import _hash_password
+from app.services.import_service import sync_sequences
+from app.commands import recompute_counters
+
+PASSWORD = "bench-password"
+BATCH_SIZE = 1000
+
+WORDS = (
+    "flask api latency cache query index python database redis worker "
+    "request response token comment post like feed page cursor search "
+    "deploy profile benchmark throughput session engine pool replica"
+).split()
+
+
+def make_app(database_uri, rounds, overrides=None):
+    config = {
+        "SQLALCHEMY_DATABASE_URI": database_uri,
+        "JWT_SECRET_KEY": os.getenv(
+            "JWT_SECRET_KEY", "bench-secret-key-with-at-least-32-characters"
+        ),
+        "RATELIMIT_ENABLED": False,
+        "BCRYPT_LOG_ROUNDS": rounds,
+        "QUERY_N_PLUS_ONE_DETECTION": False,
+    }
+    config.update(overrides or {})
+    return create_app(config)
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _insert(model, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(db.insert(model), rows[start:start + BATCH_SIZE])
+
+
+# Creates `users` regular accounts plus `clients` benchmark accounts
+# (bench0, bench1, ...). Benchmark accounts own no likes, so a client can
+# like and unlike any post without hitting the unique constraint.
+def seed_dataset(users, posts, comments, likes, clients=0, rounds=4, seed=42):
+    rng = random.Random(seed)
+    password = _hash_password(PASSWORD, rounds)
+    now = datetime.utcnow()
+
+    user_rows = [
+        {
+            "id": i + 1,
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "password": password,
+            "bio": _sentence(rng, 12),
+        }
+        for i in range(users)
+    ]
+    user_rows += [
+        {
+            "id": users + i + 1,
+            "username": f"bench{i}",
+            "email": f"bench{i}@example.com",
+            "password": password,
+        }
+        for i in range(clients)
+    ]
+    _insert(User, user_rows)
+
+    post_rows, comment_rows, like_rows = [], [], []
+    comment_id = 0
+
+    for i in range(posts):
+        post_id = i + 1
+        created_at = now - timedelta(minutes=posts - i)
+        comment_count = rng.randint(0, comments * 2)
+        likers = rng.sample(range(1, users + 1), min(users, rng.randint(0, likes * 2)))
+
+        post_rows.append({
+            "id": post_id,
+            "title": _sentence(rng, 6).capitalize(),
+            "content": _sentence(rng, rng.randint(50, 300)),
+            "author_id": rng.randint(1, users),
+            "created_at": created_at,
+            "updated_at": created_at,
+            "like_count": len(likers),
+            "comment_count": comment_count,
+        })
+
+        for j in range(comment_count):
+            comment_id += 1
+            comment_rows.append({
+                "id": comment_id,
+                "text": _sentence(rng, rng.randint(5, 40)),
+                "user_id": rng.randint(1, users),
+                "post_id": post_id,
+                "created_at": created_at + timedelta(seconds=j + 1),
+            })
+
+        like_rows += [{"user_id": user_id, "post_id": post_id} for user_id in likers]
+
+    _insert(Post, post_rows)
+    _insert(Comment, comment_rows)
+    _insert(Like, like_rows)
+    db.session.commit()
+    sync_sequences(User, Post, Comment)
+    # users.post_count and the posts counter behind listing totals
+    recompute_counters()
+
+    return {
+        "users": len(user_rows),
+        "posts": len(post_rows),
+        "comments": len(comment_rows),
+        "likes": len(like_rows),
+    }
+
+
+def reset_and_seed(app, args):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        return seed_dataset(
+            args.users, args.posts, args.comments, args.likes,
+            clients=args.clients, rounds=args.rounds, seed=args.seed
+        )
+
+
+def add_dataset_arguments(parser):
+    parser.add_argument("--database-uri", default=None,
+                        help="defaults to a temporary SQLite file")
+    parser.add_argument("--reset", action="store_true",
+                        help="allow dropping all tables of --database-uri")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--comments", type=int, default=5, help="average per post")
+    parser.add_argument("--likes", type=int, default=10, help="average per post")
+    parser.add_argument("--rounds", type=int, default=4, help="bcrypt cost of seeded passwords")
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_dataset_arguments(parser)
+    parser.add_argument("--clients", type=int, default=0, help="benchmark accounts to add")
+    args = parser.parse_args()
+
+    if not args.database_uri or not args.reset:
+        parser.error("--database-uri and --reset are required; all tables are dropped")
+
+    start = time.perf_counter()
+    counts = reset_and_seed(make_app(args.database_uri, args.rounds), args)
+    elapsed = time.perf_counter() - start
+
+    print(", ".join(f"{count} {name}" for name, count in counts.items()) + f" in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -54,6 +54,20 @@ def get_metadata():
     return target_db.metadata
 
 
+# The full-text search index is created by hand in its migration and has
+# no model: skip it when comparing, so autogenerate doesn't drop it. That is
+# the FTS5 table and its shadow tables on SQLite, the tsvector column and
+# its GIN index on Postgres.
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return not name.startswith("posts_fts")
+    if type_ == "column" and parent_names.get("table_name") == "posts":
+        return name != "search_vector"
+    if type_ == "index":
+        return name != "ix_posts_search_vector"
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -68,7 +82,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_name=include_name
     )
 
     with context.begin_transaction():
@@ -96,6 +111,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_name", include_name)
 
     connectable = get_engine()
 
@@ -0,0 +1,78 @@
+"""post full text search
+
+Revision ID: 3f1c9a7d2b64
+Revises: 842c6d64a093
+Create Date: 2026-10-18 10:12:41.532107
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2b64'
+down_revision = '842c6d64a093'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        # a STORED generated column is computed for every existing row here,
+        # which backfills the index
+        op.execute("""
+            ALTER TABLE posts ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(content, '')), 'B')
+            ) STORED
+        """)
+        op.execute(
+            "CREATE INDEX ix_posts_search_vector ON posts USING GIN (search_vector)"
+        )
+
+    elif dialect == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE posts_fts USING fts5(
+                title, content, content='posts', content_rowid='id',
+                tokenize='porter unicode61'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER posts_fts_ai AFTER INSERT ON posts BEGIN
+                INSERT INTO posts_fts(rowid, title, content)
+                VALUES (new.id, new.title, new.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER posts_fts_ad AFTER DELETE ON posts BEGIN
+                INSERT INTO posts_fts(posts_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+                INSERT INTO posts_fts(posts_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+                INSERT INTO posts_fts(rowid, title, content)
+                VALUES (new.id, new.title, new.content);
+            END
+        """)
+        # backfill existing posts
+        op.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_posts_search_vector")
+        op.execute("ALTER TABLE posts DROP COLUMN IF EXISTS search_vector")
+
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS posts_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS posts_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS posts_fts_ai")
+        op.execute("DROP TABLE IF EXISTS posts_fts")
@@ -0,0 +1,34 @@
+"""updated_at columns
+
+Revision ID: 5b7e0c9f3a12
+Revises: a8e2d4c61f07
+Create Date: 2026-10-18 11:47:02.114593
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e0c9f3a12'
+down_revision = 'a8e2d4c61f07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # plain ADD/DROP COLUMN: a batch rebuild of posts on SQLite would drop
+    # the full-text search triggers
+    op.add_column('users', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.add_column('posts', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.add_column('comments', sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    op.execute("UPDATE users SET updated_at = CURRENT_TIMESTAMP")
+    op.execute("UPDATE posts SET updated_at = coalesce(created_at, CURRENT_TIMESTAMP)")
+    op.execute("UPDATE comments SET updated_at = CURRENT_TIMESTAMP")
+
+
+def downgrade():
+    op.drop_column('comments', 'updated_at')
+    op.drop_column('posts', 'updated_at')
+    op.drop_column('users', 'updated_at')
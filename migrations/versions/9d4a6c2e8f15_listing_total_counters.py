@@ -0,0 +1,38 @@
+"""listing total counters
+
+Revision ID: 9d4a6c2e8f15
+Revises: e7b3f19c0d52
+Create Date: 2026-10-18 17:31:46.502193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4a6c2e8f15'
+down_revision = 'e7b3f19c0d52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('post_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.create_table('counters',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # backfill from the existing rows
+    op.execute("""
+        UPDATE users SET
+            post_count = (SELECT count(*) FROM posts WHERE posts.author_id = users.id)
+    """)
+    op.execute("INSERT INTO counters (name, value) SELECT 'posts', count(*) FROM posts")
+
+
+def downgrade():
+    op.drop_table('counters')
+    op.drop_column('users', 'post_count')
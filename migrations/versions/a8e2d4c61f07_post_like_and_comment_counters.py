@@ -0,0 +1,36 @@
+"""post like and comment counters
+
+Revision ID: a8e2d4c61f07
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-18 11:04:19.880213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8e2d4c61f07'
+down_revision = '3f1c9a7d2b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+
+    # backfill from the existing rows
+    op.execute("""
+        UPDATE posts SET
+            like_count = (SELECT count(*) FROM likes WHERE likes.post_id = posts.id),
+            comment_count = (SELECT count(*) FROM comments WHERE comments.post_id = posts.id)
+    """)
+
+
+def downgrade():
+    # plain DROP COLUMN: a batch rebuild of posts on SQLite would also drop
+    # the full-text search triggers
+    op.drop_column('posts', 'comment_count')
+    op.drop_column('posts', 'like_count')
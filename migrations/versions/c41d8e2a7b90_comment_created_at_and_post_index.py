@@ -0,0 +1,28 @@
+"""comment created_at and post index
+
+Revision ID: c41d8e2a7b90
+Revises: 5b7e0c9f3a12
+Create Date: 2026-10-18 12:20:55.603718
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d8e2a7b90'
+down_revision = '5b7e0c9f3a12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('comments', sa.Column('created_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE comments SET created_at = coalesce(updated_at, CURRENT_TIMESTAMP)")
+
+    op.create_index('ix_comments_post_id_id', 'comments', ['post_id', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_comments_post_id_id', table_name='comments')
+    op.drop_column('comments', 'created_at')
@@ -0,0 +1,30 @@
+"""access path indexes
+
+Revision ID: e7b3f19c0d52
+Revises: c41d8e2a7b90
+Create Date: 2026-10-18 16:42:08.211537
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b3f19c0d52'
+down_revision = 'c41d8e2a7b90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_posts_created_at_id', 'posts', ['created_at', 'id'], unique=False)
+    op.create_index('ix_posts_author_id_created_at_id', 'posts', ['author_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_comments_user_id', 'comments', ['user_id'], unique=False)
+    op.create_index('ix_likes_post_id', 'likes', ['post_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_likes_post_id', table_name='likes')
+    op.drop_index('ix_comments_user_id', table_name='comments')
+    op.drop_index('ix_posts_author_id_created_at_id', table_name='posts')
+    op.drop_index('ix_posts_created_at_id', table_name='posts')
@@ -20,22 +20,59 @@ def app():
         db.session.remove()
         db.drop_all()
 
+# Apps with their own config (a file database, replicas, the like buffer...)
+# on top of fast test defaults; each one runs inside its app context
 @pytest.fixture
-def client(app):
-    return app.test_client()
-    
-@pytest.fixture
-def token(client):
+def make_app():
+    contexts = []
+
+    def make_app(**overrides):
+        app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+            "RATELIMIT_ENABLED": False,
+            "BCRYPT_LOG_ROUNDS": 4,
+            "HASHING_POOL_WORKERS": 0,
+            **overrides
+        })
+        context = app.app_context()
+        context.push()
+        contexts.append(context)
+        db.create_all()
+        return app
+
+    yield make_app
+
+    for context in reversed(contexts):
+        db.session.remove()
+        db.drop_all()
+        context.pop()
 
+def register_and_login(client, username="testuser", email="test@test.com"):
     client.post("/register", json={
-        "username": "testuser",
-        "email": "test@test.com",
+        "username": username,
+        "email": email,
         "password": "123456"
     })
 
     res = client.post("/login", json={
-        "username": "testuser",
+        "username": username,
         "password": "123456"
     })
 
     return res.json["data"]["access_token"]
+
+# Authorization headers for a new user on the given client
+@pytest.fixture
+def login():
+    def login(client, username="testuser", email="test@test.com"):
+        return {"Authorization": f"Bearer {register_and_login(client, username, email)}"}
+    return login
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+    
+@pytest.fixture
+def token(client):
+    return register_and_login(client)
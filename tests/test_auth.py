@@ -1,3 +1,13 @@
+import time
+from datetime import datetime, timedelta
+import bcrypt as bcrypt_lib
+import pytest
+from app.extensions import db
+from app.models import TokenBlockList, User
+from app.utils.hashing import hashing_pool, hash_rounds, HashingPoolBusy
+from app.utils.token_blocklist import TokenBlocklist, MemoryBlocklistStore
+
+
 def test_register(client):
     
     res = client.post("/register", json={
@@ -23,3 +33,122 @@ def test_login(client):
 
     assert res.status_code == 200
     assert "access_token" in res.json["data"]
+
+def test_logout_revokes_token(client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/me", headers=headers).status_code == 200
+
+    client.post("/logout", headers=headers)
+
+    assert client.get("/me", headers=headers).status_code == 401
+
+def test_blocklist_syncs_revocations_between_workers(app):
+    app.config["JWT_BLOCKLIST_STORE"] = "memory"
+    app.config["JWT_BLOCKLIST_SYNC_SECONDS"] = 0
+    worker_a = TokenBlocklist(app)
+    worker_b = TokenBlocklist(app)
+    worker_b.store = worker_a.store = MemoryBlocklistStore()
+
+    assert worker_b.is_revoked("abc") is False
+
+    worker_a.revoke("abc", time.time() + 60)
+    worker_a.revoke("expired", time.time() - 1)
+
+    assert worker_b.is_revoked("abc") is True
+    assert worker_b.is_revoked("expired") is False
+
+def test_blocklist_backs_off_while_store_is_down(app, monkeypatch):
+    app.config["JWT_BLOCKLIST_STORE"] = "memory"
+    app.config["JWT_BLOCKLIST_SYNC_SECONDS"] = 0
+    worker = TokenBlocklist(app)
+
+    calls = []
+    def unreachable(now):
+        calls.append(now)
+        raise ConnectionError("store down")
+    monkeypatch.setattr(worker.store, "active", unreachable)
+
+    # the table answers while the store is retried only once per backoff
+    assert worker.is_revoked("abc") is False
+    assert worker.is_revoked("abc") is False
+    assert len(calls) == 1
+
+    clock = time.time()
+    monkeypatch.setattr(time, "time", lambda: clock + 1.5)
+    assert worker.is_revoked("abc") is False
+    assert len(calls) == 2
+    assert worker.is_revoked("abc") is False
+    assert len(calls) == 2
+
+    # back online: synced again once the (doubled) delay has passed
+    monkeypatch.delattr(worker.store, "active")
+    monkeypatch.setattr(time, "time", lambda: clock + 4)
+    worker.store.add("abc", clock + 60)
+    assert worker.is_revoked("abc") is True
+    assert worker._retry_at is None
+
+def test_purge_blocklist(app):
+    db.session.add(TokenBlockList(jti="old", created_at=datetime.utcnow() - timedelta(days=1)))
+    db.session.add(TokenBlockList(jti="new", created_at=datetime.utcnow()))
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["blocklist", "purge"])
+
+    assert "Purged 1" in result.output
+    assert [row.jti for row in TokenBlockList.query.all()] == ["new"]
+
+def test_login_rehashes_password_with_new_cost(app, client):
+    old_hash = bcrypt_lib.hashpw(b"123456", bcrypt_lib.gensalt(4)).decode("utf-8")
+    db.session.add(User(username="old", email="old@test.com", password=old_hash))
+    db.session.commit()
+
+    res = client.post("/login", json={"username": "old", "password": "123456"})
+
+    assert res.status_code == 200
+    user = User.query.filter_by(username="old").first()
+    assert hash_rounds(user.password) == app.config["BCRYPT_LOG_ROUNDS"]
+
+def test_login_returns_503_when_hashing_pool_is_saturated(app, client):
+    app.config["HASHING_POOL_MAX_PENDING"] = 0
+    hashing_pool.init_app(app)
+
+    res = client.post("/register", json={
+        "username": "john",
+        "email": "john@test.com",
+        "password": "123456"
+    })
+
+    assert res.status_code == 503
+    assert res.headers["Retry-After"] == "1"
+
+def test_timed_out_hash_keeps_its_slot_until_done(app, monkeypatch):
+    app.config.update(
+        HASHING_POOL_WORKERS=1,
+        HASHING_POOL_MAX_PENDING=1,
+        HASHING_POOL_TIMEOUT=0.01,
+        BCRYPT_LOG_ROUNDS=12
+    )
+    hashing_pool.init_app(app)
+
+    try:
+        with pytest.raises(HashingPoolBusy):
+            hashing_pool.generate_password_hash("123456")
+
+        # the caller gave up, but bcrypt is still busy with its hash
+        monkeypatch.setattr(hashing_pool, "timeout", 10)
+        with pytest.raises(HashingPoolBusy):
+            hashing_pool.generate_password_hash("123456")
+
+        # once it is done there is room again
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                assert hash_rounds(hashing_pool.generate_password_hash("123456")) == 12
+                break
+            except HashingPoolBusy:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+    finally:
+        app.config["HASHING_POOL_WORKERS"] = 0
+        hashing_pool.init_app(app)
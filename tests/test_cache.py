@@ -0,0 +1,119 @@
+import threading
+import time
+import app.utils.cache as cache_module
+from app.extensions import cache
+from app.utils.cache import MemoryCache
+
+
+def test_post_responses_are_cached_and_invalidated_by_tag(client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    first = client.post("/posts", headers=headers, json={"title": "A", "content": "a"}).json["data"]["id"]
+    second = client.post("/posts", headers=headers, json={"title": "B", "content": "b"}).json["data"]["id"]
+
+    assert client.get(f"/posts/{first}").headers["X-Cache"] == "MISS"
+    assert client.get(f"/posts/{second}").headers["X-Cache"] == "MISS"
+    assert client.get(f"/posts/{first}").headers["X-Cache"] == "HIT"
+
+    client.post(f"/posts/{first}/like", headers=headers)
+
+    res = client.get(f"/posts/{first}")
+    assert res.headers["X-Cache"] == "MISS"
+    assert res.json["data"]["like_count"] == 1
+    # liking one post leaves the other one cached
+    assert client.get(f"/posts/{second}").headers["X-Cache"] == "HIT"
+
+def test_listing_cache_key_ignores_arg_order(client, token):
+
+    client.get("/posts?page=1&per_page=5")
+
+    assert client.get("/posts?per_page=5&page=1").headers["X-Cache"] == "HIT"
+
+def test_memory_cache_lru_and_ttl():
+    cache = MemoryCache(max_entries=2)
+
+    cache.set("a", 1, 60)
+    cache.set("b", 2, 60)
+    cache.get_many(["a"])
+    cache.set("c", 3, 60)   # evicts "b", the least recently used
+    assert cache.get_many(["a", "b", "c"]) == [1, None, 3]
+
+    cache.set("d", 4, -1)   # already expired
+    assert cache.get_many(["d"]) == [None]
+
+def test_concurrent_misses_render_once(app):
+    calls = []
+
+    @app.route("/slow")
+    @cache.cached(tags=["slow"])
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"value": len(calls)}
+
+    results = []
+    def fetch():
+        res = app.test_client().get("/slow")
+        results.append((res.status_code, res.json["value"]))
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [(200, 1)] * 8
+
+def test_expired_entry_is_served_stale_while_refreshing(app, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    @app.route("/stale")
+    @cache.cached(tags=["stale"], timeout=1)
+    def stale():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(5)
+        return {"value": len(calls)}
+
+    client = app.test_client()
+    assert client.get("/stale").json["value"] == 1
+
+    # jump past the entry's timeout, still within CACHE_STALE_TTL
+    real_time = cache_module.time.time
+    monkeypatch.setattr(cache_module.time, "time", lambda: real_time() + 5)
+
+    refresher = threading.Thread(target=lambda: app.test_client().get("/stale"))
+    refresher.start()
+    while len(calls) < 2:
+        release.wait(0.01)
+
+    res = client.get("/stale")
+    release.set()
+    refresher.join()
+
+    assert res.headers["X-Cache"] == "STALE"
+    assert res.json["value"] == 1
+    assert client.get("/stale").json["value"] == 2
+
+def test_hot_entry_is_refreshed_before_it_expires(app, monkeypatch):
+    calls = []
+
+    @app.route("/hot")
+    @cache.cached(tags=["hot"])
+    def hot():
+        calls.append(1)
+        return {"value": len(calls)}
+
+    client = app.test_client()
+    client.get("/hot")
+    assert client.get("/hot").headers["X-Cache"] == "HIT"
+
+    # an unlucky draw makes this request refresh the entry ahead of expiry
+    monkeypatch.setattr(cache, "beta", 10 ** 9)
+    monkeypatch.setattr(cache_module.random, "random", lambda: 0.999)
+    res = client.get("/hot")
+
+    assert res.headers["X-Cache"] == "MISS"
+    assert res.json["value"] == 2
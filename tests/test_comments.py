@@ -1,3 +1,6 @@
+import json
+
+
 def test_create_comment(client, token):
 
     post = client.post(   #create a post first
@@ -17,4 +20,52 @@ def test_create_comment(client, token):
         }
     )
 
-    assert res.status_code == 201
\ No newline at end of file
+    assert res.status_code == 201
+
+def test_comment_count_is_maintained(client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    post_id = client.post(
+        "/posts", headers=headers, json={"title": "Test", "content": "Hello"}
+    ).json["data"]["id"]
+
+    comment_id = client.post(
+        f"/posts/{post_id}/comments", headers=headers, json={"text": "Nice post"}
+    ).json["data"]["id"]
+    assert client.get(f"/posts/{post_id}").json["data"]["comment_count"] == 1
+
+    client.delete(f"/comments/{comment_id}", headers=headers)
+    assert client.get(f"/posts/{post_id}").json["data"]["comment_count"] == 0
+
+def test_get_comments_paginated(client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    post_id = client.post(
+        "/posts", headers=headers, json={"title": "Test", "content": "Hello"}
+    ).json["data"]["id"]
+    for i in range(5):
+        client.post(f"/posts/{post_id}/comments", headers=headers, json={"text": f"c{i}"})
+
+    texts = []
+    cursor = ""
+    while cursor is not None:
+        res = client.get(f"/posts/{post_id}/comments?per_page=2&cursor={cursor}")
+        assert res.json["data"]["total"] == 5
+        texts += [c["text"] for c in res.json["data"]["items"]]
+        cursor = res.json["data"]["next_cursor"]
+
+    assert texts == ["c0", "c1", "c2", "c3", "c4"]
+
+def test_get_comments_ndjson_stream(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    post_id = client.post(
+        "/posts", headers=headers, json={"title": "Test", "content": "Hello"}
+    ).json["data"]["id"]
+    for i in range(3):
+        client.post(f"/posts/{post_id}/comments", headers=headers, json={"text": f"c{i}"})
+
+    res = client.get(f"/posts/{post_id}/comments?format=ndjson")
+
+    assert res.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in res.data.decode().splitlines()]
+    assert [c["text"] for c in lines] == ["c0", "c1", "c2"]
@@ -0,0 +1,100 @@
+import re
+import threading
+import pytest
+from app.extensions import db
+from app.models import Like, Post, User
+
+
+@pytest.fixture
+def file_app(make_app, tmp_path):
+    return make_app(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'writes.db'}",
+        SQLALCHEMY_ENGINE_OPTIONS={"connect_args": {"timeout": 30}},
+        SERVER_TIMING_ENABLED=True,
+        CACHE_TYPE="null",
+        # keeps the token check out of the query counts
+        JWT_BLOCKLIST_STORE="memory",
+    )
+
+
+def _parallel(app, requests):
+    results = [None] * len(requests)
+    barrier = threading.Barrier(len(requests))
+
+    def run(i, method, url, kwargs):
+        client = app.test_client()
+        barrier.wait()
+        results[i] = getattr(client, method)(url, **kwargs)
+
+    threads = [
+        threading.Thread(target=run, args=(i, *request))
+        for i, request in enumerate(requests)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def _queries(response):
+    return int(re.search(r'"(\d+) queries"', response.headers["Server-Timing"]).group(1))
+
+
+def test_parallel_registrations_create_one_user(file_app):
+    body = {"username": "racer", "email": "racer@example.com", "password": "123456"}
+
+    results = _parallel(file_app, [("post", "/register", {"json": body})] * 8)
+
+    assert sorted(r.status_code for r in results) == [201] + [400] * 7
+    assert {r.json["error"] for r in results if r.status_code == 400} == {"Username already exists"}
+    assert User.query.count() == 1
+    # the INSERT alone on success
+    assert [_queries(r) for r in results if r.status_code == 201] == [1]
+
+def test_parallel_likes_count_once(file_app, login):
+    client = file_app.test_client()
+    headers = login(client)
+    post_id = client.post("/posts", headers=headers, json={"title": "T", "content": "c"}).json["data"]["id"]
+
+    results = _parallel(file_app, [("post", f"/posts/{post_id}/like", {"headers": headers})] * 8)
+
+    assert sorted(r.status_code for r in results) == [201] + [400] * 7
+    assert Like.query.count() == 1
+    db.session.expire_all()
+    assert db.session.get(Post, post_id).like_count == 1
+    # INSERT ... SELECT and the counter UPDATE
+    assert [_queries(r) for r in results if r.status_code == 201] == [2]
+
+    assert client.post("/posts/999/like", headers=headers).status_code == 404
+
+def test_parallel_unlikes_and_comment_deletes_count_once(file_app, login):
+    client = file_app.test_client()
+    headers = login(client)
+    post_id = client.post("/posts", headers=headers, json={"title": "T", "content": "c"}).json["data"]["id"]
+    client.post(f"/posts/{post_id}/like", headers=headers)
+    comment_id = client.post(f"/posts/{post_id}/comments", headers=headers, json={"text": "hi"}).json["data"]["id"]
+
+    unlikes = _parallel(file_app, [("delete", f"/posts/{post_id}/like", {"headers": headers})] * 8)
+    deletes = _parallel(file_app, [("delete", f"/comments/{comment_id}", {"headers": headers})] * 8)
+
+    assert sorted(r.status_code for r in unlikes) == [200] + [404] * 7
+    assert sorted(r.status_code for r in deletes) == [200] + [404] * 7
+    db.session.expire_all()
+    post = db.session.get(Post, post_id)
+    assert (post.like_count, post.comment_count) == (0, 0)
+    # DELETE ... RETURNING and the counter UPDATE
+    assert [_queries(r) for r in unlikes if r.status_code == 200] == [2]
+
+def test_parallel_post_deletes_count_once(file_app, login):
+    client = file_app.test_client()
+    headers = login(client)
+    keep = client.post("/posts", headers=headers, json={"title": "Keep", "content": "c"}).json["data"]["id"]
+    gone = client.post("/posts", headers=headers, json={"title": "Gone", "content": "c"}).json["data"]["id"]
+
+    results = _parallel(file_app, [("delete", f"/posts/{gone}", {"headers": headers})] * 8)
+
+    assert sorted(r.status_code for r in results) == [200] + [404] * 7
+    assert client.get("/posts").json["data"]["total"] == 1
+    assert client.get("/my-posts?page=1", headers=headers).json["data"]["pagination"]["total"] == 1
+    assert [p["id"] for p in client.get("/posts").json["data"]["items"]] == [keep]
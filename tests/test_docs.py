@@ -0,0 +1,27 @@
+import json
+from app import create_app
+
+
+def test_spec_is_built_on_first_request_and_cached(client, app):
+    swagger = app.swag
+    assert swagger.apispecs == {}
+
+    first = client.get("/apispec.json")
+    assert first.status_code == 200
+    assert "/posts" in first.json["paths"]
+    assert "apispec" in swagger.apispecs
+
+def test_exported_spec_file_is_served(tmp_path):
+    spec_file = tmp_path / "apispec.json"
+    spec_file.write_text(json.dumps({"swagger": "2.0", "paths": {"/exported": {}}}))
+
+    app = create_app({"SWAGGER_SPEC_FILE": str(spec_file)})
+
+    assert list(app.test_client().get("/apispec.json").json["paths"]) == ["/exported"]
+
+def test_docs_can_be_disabled():
+    app = create_app({"SWAGGER_ENABLED": False})
+    client = app.test_client()
+
+    assert client.get("/apispec.json").status_code == 404
+    assert client.get("/docs/").status_code == 404
@@ -0,0 +1,46 @@
+def test_post_etag_returns_304_until_post_changes(client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    post_id = client.post(
+        "/posts", headers=headers, json={"title": "Test", "content": "Hello"}
+    ).json["data"]["id"]
+
+    res = client.get(f"/posts/{post_id}")
+    etag = res.headers["ETag"]
+
+    res = client.get(f"/posts/{post_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.data == b""
+
+    client.post(f"/posts/{post_id}/like", headers=headers)
+
+    res = client.get(f"/posts/{post_id}", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+def test_listing_etags(client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    post_id = client.post(
+        "/posts", headers=headers, json={"title": "Test", "content": "Hello"}
+    ).json["data"]["id"]
+
+    for url in ["/posts", f"/posts/{post_id}/comments"]:
+        etag = client.get(url).headers["ETag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    etag = client.get(f"/posts/{post_id}/comments").headers["ETag"]
+    client.post(f"/posts/{post_id}/comments", headers=headers, json={"text": "Hi"})
+    res = client.get(f"/posts/{post_id}/comments", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+
+def test_user_profile_etag(client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = client.get("/me", headers=headers).json["data"]["id"]
+
+    etag = client.get(f"/users/{user_id}").headers["ETag"]
+    assert client.get(f"/users/{user_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put("/users/me", headers=headers, json={"bio": "Hello"})
+    assert client.get(f"/users/{user_id}", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,58 @@
+from sqlalchemy import event
+from app.extensions import db
+
+
+def count_statements(app, fn):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return result, statements
+
+def test_feed_includes_author_and_counts(client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    post_id = client.post(
+        "/posts", headers=headers, json={"title": "Test", "content": "x" * 500}
+    ).json["data"]["id"]
+    client.post(f"/posts/{post_id}/like", headers=headers)
+
+    item = client.get("/feed").json["data"]["items"][0]
+
+    assert item["author"]["username"] == "testuser"
+    assert item["like_count"] == 1
+    assert item["comment_count"] == 0
+    assert len(item["excerpt"]) == 200
+
+def test_feed_statement_count_does_not_grow_with_page_size(app, client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(12):
+        client.post("/posts", headers=headers, json={"title": f"P{i}", "content": "Hello"})
+
+    small, small_statements = count_statements(app, lambda: client.get("/feed?per_page=2"))
+    large, large_statements = count_statements(app, lambda: client.get("/feed?per_page=12"))
+
+    assert len(small.json["data"]["items"]) == 2
+    assert len(large.json["data"]["items"]) == 12
+    assert len(small_statements) == len(large_statements) == 1
+
+def test_feed_rows_format(client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/posts", headers=headers, json={"title": "Test", "content": "Hello"})
+
+    data = client.get("/feed?format=rows").json["data"]
+    row = dict(zip(data["columns"], data["rows"][0]))
+
+    assert row["title"] == "Test"
+    assert row["username"] == "testuser"
+    # dates are ISO 8601 with both JSON backends
+    assert row["created_at"][:4].isdigit() and "T" in row["created_at"]
@@ -0,0 +1,54 @@
+import threading
+import time
+from app.utils.health import health
+
+
+def test_health_is_served_from_the_last_probe(client, monkeypatch):
+    calls = []
+    probe = health.probe
+    monkeypatch.setattr(health, "probe", lambda: calls.append(1) or probe())
+
+    first = client.get("/health").json
+    second = client.get("/health").json
+
+    assert first["status"] == "healthy"
+    assert first["services"] == {"database": "ok", "redis": "disabled"}
+    assert second["age_seconds"] >= 0 and "checked_at" in second
+    assert len(calls) == 1
+
+def test_ready_fails_when_database_probe_fails(client, monkeypatch):
+    monkeypatch.setattr(health, "_check_database", lambda engine: "error")
+
+    assert client.get("/health/live").status_code == 200
+    res = client.get("/health/ready")
+
+    assert res.status_code == 503
+    assert res.json["services"]["database"] == "error"
+
+def test_first_requests_probe_once_and_see_a_whole_result(app, monkeypatch):
+    calls = []
+    probe = health.probe
+    monkeypatch.setattr(health, "probe", lambda: calls.append(1) or probe())
+    monkeypatch.setattr(app, "testing", False)
+    monkeypatch.setattr(health, "interval", 60)
+
+    reports = []
+    def check():
+        with app.app_context():
+            reports.append(health.current())
+
+    threads = [threading.Thread(target=check) for _ in range(8)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # give a prober that starts straight away time to show up
+        time.sleep(0.1)
+    finally:
+        health.stop()
+
+    # one inline probe; the prober thread waits an interval before its own
+    assert len(calls) == 1
+    assert len(reports) == 8
+    assert all(report["age_seconds"] >= 0 for report in reports)
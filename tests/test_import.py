@@ -0,0 +1,42 @@
+from app.models import User, Post
+from app.services import import_service
+
+
+def test_import_users_from_csv_hashes_passwords_and_skips_bad_rows(app, tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "username,email,password\n"
+        "alice,alice@example.com,secret1\n"
+        "bob,bob@example.com,secret2\n"
+        "alice,other@example.com,secret3\n"
+        "carol,,secret4\n"
+    )
+
+    result = import_service.import_entity(
+        "users", import_service.read_records(str(path)), batch_size=10, rounds=4
+    )
+
+    assert (result.read, result.inserted, result.skipped) == (4, 2, 2)
+    assert {u.username for u in User.query.all()} == {"alice", "bob"}
+    assert User.query.filter_by(username="bob").one().password.startswith("$2b$04$")
+
+def test_import_posts_from_ndjson_keeps_other_rows_of_a_failing_batch(app, tmp_path):
+    path = tmp_path / "posts.ndjson"
+    path.write_text(
+        '{"id": 1, "title": "One", "content": "a", "author_id": 1, "created_at": "2025-01-01T10:00:00Z"}\n'
+        '{"id": 1, "title": "Duplicate", "content": "b", "author_id": 1}\n'
+        '{"title": "Two", "content": "c", "author_id": 1}\n'
+        'not json\n'
+        '[]\n'
+        '5\n'
+    )
+
+    batches = []
+    result = import_service.import_entity(
+        "posts", import_service.read_records(str(path)), batch_size=3, on_batch=batches.append
+    )
+
+    assert (result.inserted, result.skipped) == (2, 4)
+    assert len(batches) == 2
+    assert sorted(p.title for p in Post.query.all()) == ["One", "Two"]
+    assert Post.query.get(1).created_at.year == 2025
@@ -0,0 +1,14 @@
+from datetime import datetime
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+
+
+def test_stdlib_fallback_matches_orjson(app, monkeypatch):
+    provider = FastJSONProvider(app)
+    payload = {"b": 1, "a": "é", "at": datetime(2026, 1, 2, 3, 4, 5, 6)}
+
+    fast = provider.loads(provider.dumps(payload))
+    monkeypatch.setattr(json_provider, "orjson", None)
+    stdlib = provider.loads(provider.dumps(payload))
+
+    assert fast == stdlib == {"b": 1, "a": "é", "at": "2026-01-02T03:04:05.000006"}
@@ -0,0 +1,97 @@
+import pytest
+from app.extensions import db
+from app.models import Like, Post
+from app.services.like_buffer import like_buffer
+
+
+@pytest.fixture
+def buffered_client(make_app, login):
+    client = make_app(LIKE_BUFFER_ENABLED=True, LIKE_BUFFER_REDIS_URL=None).test_client()
+    client.headers = login(client)
+    return client
+
+
+def _new_post(client):
+    return client.post(
+        "/posts", headers=client.headers, json={"title": "Hot", "content": "x"}
+    ).json["data"]["id"]
+
+
+def test_buffered_like_is_visible_before_the_flush(buffered_client):
+    client = buffered_client
+    post_id = _new_post(client)
+
+    res = client.post(f"/posts/{post_id}/like", headers=client.headers)
+    assert res.status_code == 202
+    assert Like.query.count() == 0
+
+    assert client.get(f"/posts/{post_id}/likes-count").json["data"]["likes"] == 1
+    status = client.post("/likes/status", headers=client.headers, json={"post_ids": [post_id]})
+    assert status.json["data"]["items"] == [{"post_id": post_id, "likes": 1, "liked": True}]
+
+    assert like_buffer.flush() == 1
+
+    assert Like.query.count() == 1
+    assert db.session.get(Post, post_id).like_count == 1
+    assert client.get(f"/posts/{post_id}/likes-count").json["data"]["likes"] == 1
+
+def test_buffered_duplicates_and_unlikes(buffered_client):
+    client = buffered_client
+    post_id = _new_post(client)
+
+    assert client.post(f"/posts/{post_id}/like", headers=client.headers).status_code == 202
+    assert client.post(f"/posts/{post_id}/like", headers=client.headers).status_code == 400
+    like_buffer.flush()
+    assert client.post(f"/posts/{post_id}/like", headers=client.headers).status_code == 400
+
+    assert client.delete(f"/posts/{post_id}/like", headers=client.headers).status_code == 202
+    assert client.delete(f"/posts/{post_id}/like", headers=client.headers).status_code == 404
+    assert client.get(f"/posts/{post_id}/likes-count").json["data"]["likes"] == 0
+
+    like_buffer.flush()
+    assert Like.query.count() == 0
+    assert db.session.get(Post, post_id).like_count == 0
+    assert client.post("/posts/999/like", headers=client.headers).status_code == 404
+
+def test_flush_skips_likes_of_deleted_posts(buffered_client):
+    client = buffered_client
+    deleted, kept = _new_post(client), _new_post(client)
+
+    client.post(f"/posts/{deleted}/like", headers=client.headers)
+    client.post(f"/posts/{kept}/like", headers=client.headers)
+    assert client.delete(f"/posts/{deleted}", headers=client.headers).status_code == 200
+
+    assert like_buffer.flush() == 2
+
+    assert [like.post_id for like in Like.query.all()] == [kept]
+    assert db.session.get(Post, kept).like_count == 1
+    # nothing is left behind to fail the next flush
+    assert like_buffer.flush() == 0
+
+def test_post_payloads_include_buffered_likes(buffered_client):
+    client = buffered_client
+    post_id = _new_post(client)
+
+    # warm the caches and ETag before the like
+    etag = client.get(f"/posts/{post_id}").headers["ETag"]
+    client.get("/posts")
+    client.get("/feed")
+
+    client.post(f"/posts/{post_id}/like", headers=client.headers)
+
+    single = client.get(f"/posts/{post_id}", headers={"If-None-Match": etag})
+    assert single.status_code == 200
+    assert single.json["data"]["like_count"] == 1
+    assert client.get(f"/posts?ids={post_id}").json["data"]["items"][0]["like_count"] == 1
+    assert client.get("/posts").json["data"]["items"][0]["like_count"] == 1
+    assert client.get("/posts?cursor=").json["data"]["items"][0]["like_count"] == 1
+    assert client.get("/my-posts", headers=client.headers).json["data"]["items"][0]["like_count"] == 1
+    assert client.get("/feed").json["data"]["items"][0]["like_count"] == 1
+
+    rows = client.get("/feed?format=rows").json["data"]
+    assert rows["rows"][0][rows["columns"].index("like_count")] == 1
+
+    # and the same once the like is in the table
+    like_buffer.flush()
+    assert client.get(f"/posts/{post_id}").json["data"]["like_count"] == 1
+    assert client.get("/feed").json["data"]["items"][0]["like_count"] == 1
@@ -1,3 +1,7 @@
+from app.extensions import db
+from app.models import Post
+
+
 def test_like_post(client, token):
 
     post = client.post(
@@ -18,3 +22,60 @@ def test_like_post(client, token):
     )
 
     assert res.status_code == 201
+
+def test_like_count_is_maintained(client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    post_id = client.post(
+        "/posts", headers=headers, json={"title": "Test", "content": "Hello"}
+    ).json["data"]["id"]
+
+    client.post(f"/posts/{post_id}/like", headers=headers)
+    res = client.get(f"/posts/{post_id}/likes-count")
+    assert res.json["data"]["likes"] == 1
+    assert client.get(f"/posts/{post_id}").json["data"]["like_count"] == 1
+
+    client.delete(f"/posts/{post_id}/like", headers=headers)
+    res = client.get(f"/posts/{post_id}/likes-count")
+    assert res.json["data"]["likes"] == 0
+
+def test_reconcile_counters(app, client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    post_id = client.post(
+        "/posts", headers=headers, json={"title": "Test", "content": "Hello"}
+    ).json["data"]["id"]
+    client.post(f"/posts/{post_id}/like", headers=headers)
+    client.post(f"/posts/{post_id}/comments", headers=headers, json={"text": "Hi"})
+
+    db.session.execute(db.update(Post).values(like_count=7, comment_count=7))
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["counters", "reconcile"])
+    assert "1 posts" in result.output
+
+    post = db.session.get(Post, post_id)
+    assert (post.like_count, post.comment_count) == (1, 1)
+
+def test_likes_status_for_many_posts(client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    first, second = [
+        client.post(
+            "/posts", headers=headers, json={"title": "Test", "content": "Hello"}
+        ).json["data"]["id"]
+        for _ in range(2)
+    ]
+    client.post(f"/posts/{second}/like", headers=headers)
+
+    res = client.post(
+        "/likes/status", headers=headers, json={"post_ids": [second, first, 999]}
+    )
+
+    assert res.status_code == 200
+    assert res.json["data"]["items"] == [
+        {"post_id": second, "likes": 1, "liked": True},
+        {"post_id": first, "likes": 0, "liked": False}
+    ]
+
+    res = client.post("/likes/status", json={"post_ids": [second]})
+    assert res.json["data"]["items"] == [{"post_id": second, "likes": 1, "liked": False}]
@@ -0,0 +1,60 @@
+import json
+import os
+import threading
+from app.utils import metrics as metrics_module
+from app.utils.metrics import metrics
+
+
+def test_metrics_endpoint_reports_requests(client):
+
+    client.get("/posts")
+    client.get("/posts")
+    client.get("/no-such-page")
+
+    body = client.get("/metrics").get_data(as_text=True)
+
+    assert 'http_requests_total{endpoint="posts.get_posts",method="GET",status="200"} 2' in body
+    assert 'http_requests_total{endpoint="unmatched",method="GET",status="404"} 1' in body
+    assert 'http_request_duration_seconds_count{endpoint="posts.get_posts",method="GET"} 2' in body
+    assert "# TYPE http_response_size_bytes histogram" in body
+
+def test_metrics_are_summed_across_workers(app, client, tmp_path):
+    app.config["METRICS_MULTIPROC_DIR"] = str(tmp_path)
+    metrics.multiproc_dir = str(tmp_path)
+
+    # a worker that has exited: its counters stay, its gauges go
+    other_worker = [
+        ["http_requests_total", [["endpoint", "posts.get_posts"], ["method", "GET"], ["status", "200"]], 5],
+        ["http_requests_in_flight", [["endpoint", "posts.get_posts"], ["method", "GET"]], 3],
+    ]
+    (tmp_path / "metrics_999999999.json").write_text(json.dumps(other_worker))
+
+    client.get("/posts")
+    body = client.get("/metrics").get_data(as_text=True)
+
+    assert 'http_requests_total{endpoint="posts.get_posts",method="GET",status="200"} 6' in body
+    assert 'http_requests_in_flight{endpoint="posts.get_posts",method="GET"} 0' in body
+
+def test_concurrent_flushes_never_fail_requests(app, tmp_path, monkeypatch):
+    app.config["METRICS_MULTIPROC_DIR"] = str(tmp_path)
+    monkeypatch.setattr(metrics, "multiproc_dir", str(tmp_path))
+    monkeypatch.setattr(metrics, "flush_interval", 0)
+
+    statuses = []
+    def fetch():
+        client = app.test_client()
+        statuses.extend(client.get("/metrics").status_code for _ in range(20))
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert set(statuses) == {200}
+    assert [p.name for p in tmp_path.iterdir()] == [f"metrics_{os.getpid()}.json"]
+
+    # a failing export is logged, the request still succeeds
+    monkeypatch.setattr(metrics_module.json, "dump", lambda *a, **k: 1 / 0)
+    assert app.test_client().get("/metrics").status_code == 200
+    assert [p.suffix for p in tmp_path.iterdir()] == [".json"]
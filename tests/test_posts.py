@@ -11,3 +11,82 @@ def test_create_posts(client, token):
     
     assert res.status_code == 201
 
+
+def test_get_posts_cursor_pagination(client, token):
+
+    for i in range(5):
+        client.post(
+            "/posts",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"title": f"Post {i}", "content": "Hello"}
+        )
+
+    res = client.get("/posts?cursor=&per_page=2")
+    assert res.status_code == 200
+    assert [p["title"] for p in res.json["data"]["items"]] == ["Post 4", "Post 3"]
+
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        res = client.get(f"/posts?cursor={cursor}&per_page=2")
+        seen += [p["title"] for p in res.json["data"]["items"]]
+        cursor = res.json["data"]["next_cursor"]
+
+    assert seen == [f"Post {i}" for i in range(4, -1, -1)]
+    assert "total" not in res.json["data"]
+
+def test_get_posts_invalid_cursor(client):
+
+    res = client.get("/posts?cursor=not-a-cursor")
+
+    assert res.status_code == 400
+
+def test_get_my_posts_cursor_pagination(client, token):
+
+    for i in range(3):
+        client.post(
+            "/posts",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"title": f"Mine {i}", "content": "Hello"}
+        )
+
+    res = client.get(
+        "/my-posts?cursor=&per_page=2",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert res.status_code == 200
+    assert len(res.json["data"]["items"]) == 2
+    assert res.json["data"]["has_next"] is True
+
+def test_search_posts_ranked_by_relevance(client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/posts", headers=headers, json={"title": "Cooking", "content": "Notes on flask and python"})
+    client.post("/posts", headers=headers, json={"title": "Flask tips", "content": "Blueprints"})
+    client.post("/posts", headers=headers, json={"title": "Gardening", "content": "Tomatoes"})
+
+    res = client.get("/posts?search=flask")
+    titles = [p["title"] for p in res.json["data"]["items"]]
+
+    assert titles == ["Flask tips", "Cooking"]
+    assert res.json["data"]["total"] == 2
+
+    res = client.get("/posts?search=garden")   # prefix/stemmed match
+    assert [p["title"] for p in res.json["data"]["items"]] == ["Gardening"]
+
+def test_get_posts_by_ids(client, token):
+
+    headers = {"Authorization": f"Bearer {token}"}
+    ids = [
+        client.post(
+            "/posts", headers=headers, json={"title": f"Post {i}", "content": "Hello"}
+        ).json["data"]["id"]
+        for i in range(3)
+    ]
+
+    res = client.get(f"/posts?ids={ids[2]},{ids[0]},999")
+
+    assert res.status_code == 200
+    assert [p["id"] for p in res.json["data"]["items"]] == [ids[2], ids[0]]
+    assert client.get("/posts?ids=1,abc").status_code == 400
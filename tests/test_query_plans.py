@@ -0,0 +1,120 @@
+import os
+import re
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models import Comment, Like, Post, User
+from app.services.trending import trending
+
+# Every statement a hot route runs goes through EXPLAIN; a plan that reads a
+# whole table (or sorts one) means a missing index. Runs on SQLite always
+# and on Postgres when TEST_POSTGRES_URL is set.
+DATABASES = ["sqlite:///:memory:"]
+if os.getenv("TEST_POSTGRES_URL"):
+    DATABASES.append(os.environ["TEST_POSTGRES_URL"])
+
+HOT_TABLES = ("posts", "comments", "likes", "users")
+
+
+@pytest.fixture(params=DATABASES, ids=lambda url: url.split(":")[0])
+def plan_app(request, make_app):
+    return make_app(
+        SQLALCHEMY_DATABASE_URI=request.param,
+        CACHE_TYPE="null",
+        JWT_BLOCKLIST_STORE="memory",
+    )
+
+
+@pytest.fixture
+def seeded(plan_app, login):
+    users = [User(username=f"user{i}", email=f"user{i}@example.com", password="x") for i in range(3)]
+    db.session.add_all(users)
+    db.session.flush()
+    posts = [Post(title=f"Post {i}", content="x", author_id=users[i % 3].id) for i in range(10)]
+    db.session.add_all(posts)
+    db.session.flush()
+    db.session.add_all([Comment(text="hi", user_id=users[0].id, post_id=p.id) for p in posts])
+    db.session.add_all([Like(user_id=users[1].id, post_id=p.id) for p in posts])
+    db.session.commit()
+
+    client = plan_app.test_client()
+    client.headers = login(client)
+    client.post(f"/posts/{posts[-1].id}/like", headers=client.headers)
+    return client, {"post_id": posts[0].id, "liked_id": posts[-1].id}
+
+
+def _capture(engine):
+    statements = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        verb = statement.lstrip().split(None, 1)[0].upper()
+        if verb in ("SELECT", "INSERT", "UPDATE", "DELETE") and not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", before)
+
+
+def _bad_plan_lines(statement, parameters):
+    with db.engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.exec_driver_sql("SET enable_seqscan = off")
+            rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).all()
+            lines = [row[0] for row in rows]
+            return [line for line in lines if "Seq Scan on" in line]
+
+        rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+        lines = [row[-1] for row in rows]
+
+    tables = "|".join(HOT_TABLES)
+    return [
+        line for line in lines
+        if re.match(rf"SCAN ({tables})\b(?!.*USING (COVERING )?INDEX)", line)
+        or "TEMP B-TREE" in line
+    ]
+
+
+def _assert_indexed(client, method, url, **kwargs):
+    statements, stop = _capture(db.engine)
+    try:
+        res = getattr(client, method)(url, headers=client.headers, **kwargs)
+    finally:
+        stop()
+
+    assert res.status_code < 300, (url, res.status_code)
+    assert statements, f"{method.upper()} {url} ran no queries"
+    for statement, parameters in statements:
+        assert not _bad_plan_lines(statement, parameters), (url, statement, _bad_plan_lines(statement, parameters))
+
+
+HOT_ROUTES = [
+    ("get", "/posts?cursor="),
+    ("get", "/posts?page=2"),
+    ("get", "/posts?cursor=&sort=old"),
+    ("get", "/feed"),
+    ("get", "/my-posts"),
+    ("get", "/my-posts?page=2"),
+    ("get", "/my-posts?cursor="),
+    ("get", "/posts/{post_id}"),
+    ("get", "/posts/{post_id}/comments"),
+    ("get", "/posts/{post_id}/likes-count"),
+    ("post", "/likes/status", {"json": {"post_ids": [1, 2, 3]}}),
+    ("post", "/posts/{post_id}/like"),
+    ("delete", "/posts/{liked_id}/like"),
+    ("post", "/posts/{post_id}/comments", {"json": {"text": "plan"}}),
+]
+
+
+@pytest.mark.parametrize("route", HOT_ROUTES, ids=lambda r: f"{r[0].upper()} {r[1]}")
+def test_hot_queries_use_indexes(seeded, route):
+    client, ids = seeded
+    method, url, kwargs = (route + ({},))[:3]
+
+    _assert_indexed(client, method, url.format(**ids), **kwargs)
+
+def test_feed_next_page_uses_index(seeded):
+    client, _ = seeded
+    cursor = client.get("/feed?per_page=3").json["data"]["next_cursor"]
+
+    _assert_indexed(client, "get", f"/feed?per_page=3&cursor={cursor}")
+    _assert_indexed(client, "get", f"/posts?per_page=3&cursor={cursor}")
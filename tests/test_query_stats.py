@@ -0,0 +1,43 @@
+import logging
+from app.models import Post
+from app.utils.query_stats import query_stats
+
+
+def test_server_timing_reports_query_count(app, client, token):
+    app.config["SERVER_TIMING_ENABLED"] = True
+
+    headers = {"Authorization": f"Bearer {token}"}
+    post_id = client.post("/posts", headers=headers, json={"title": "T", "content": "C"}).json["data"]["id"]
+
+    res = client.get(f"/posts/{post_id}/comments")
+
+    timing = res.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="' in timing and "queries" in timing
+
+def test_server_timing_is_off_by_default(client):
+
+    assert "Server-Timing" not in client.get("/posts").headers
+
+def test_repeated_statement_is_flagged_as_n_plus_one(app, caplog):
+    @app.route("/_one_by_one")
+    def one_by_one():
+        return {"posts": [Post.query.filter_by(id=i).first() is None for i in (1, 2, 3)]}
+
+    client = app.test_client()
+
+    query_stats.n_plus_one_threshold = 2
+    with caplog.at_level(logging.WARNING, logger="api_logger"):
+        client.get("/_one_by_one")
+
+    assert any("possible N+1 on GET /_one_by_one" in r.message for r in caplog.records)
+
+def test_slow_statements_are_logged_with_route(app, client, caplog):
+    query_stats.slow_ms = 0
+    try:
+        with caplog.at_level(logging.WARNING, logger="api_logger"):
+            client.get("/posts")
+    finally:
+        query_stats.slow_ms = app.config["QUERY_SLOW_MS"]
+
+    assert any("slow query" in r.message and "GET /posts" in r.message for r in caplog.records)
@@ -0,0 +1,65 @@
+from limits.storage import storage_from_string
+from app.extensions import limiter
+
+
+class FakePipeline:
+    def __init__(self, data):
+        self.data = data
+        self.replies = []
+
+    def incrby(self, key, amount):
+        self.data[key] = self.data.get(key, 0) + amount
+        self.replies.append(self.data[key])
+
+    def expire(self, key, seconds, nx=False):
+        self.replies.append(True)
+
+    def pttl(self, key):
+        self.replies.append(60000)
+
+    def execute(self):
+        return self.replies
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.data)
+
+
+def test_workers_converge_on_the_redis_total():
+    shared = FakeRedis()
+    workers = []
+    for _ in range(2):
+        # syncs only when called below or when max_pending is reached
+        storage = storage_from_string("hybrid+redis://localhost:6379/0?max_pending=2&sync_interval=3600")
+        storage.client = shared
+        workers.append(storage)
+    a, b = workers
+
+    for _ in range(3):
+        a.incr("k", 60)
+    assert shared.data["k"] == 2 and a.get("k") == 3
+
+    assert [b.incr("k", 60) for _ in range(2)] == [1, 4]
+
+    a.sync()
+    assert shared.data["k"] == 5
+    assert a.get("k") == 5
+
+def test_unreachable_redis_degrades_to_local_limits(make_app):
+    client = make_app(
+        RATELIMIT_STORAGE_URI="hybrid+redis://127.0.0.1:1/0?sync_interval=0.05",
+        RATELIMIT_ENABLED=True,
+    ).test_client()
+
+    try:
+        statuses = [client.post("/login", json={}).status_code for _ in range(6)]
+
+        assert statuses == [400] * 5 + [429]
+        limiter.storage.sync()
+        assert limiter.storage.degraded
+    finally:
+        limiter.storage.stop()
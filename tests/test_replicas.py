@@ -0,0 +1,77 @@
+import pytest
+from app.extensions import db, cache
+from app.models import Post, User
+from app.utils.replicas import replicas
+
+
+@pytest.fixture
+def replica_apps(make_app, tmp_path):
+    def replica_app(cache_type):
+        app = make_app(
+            SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'primary.db'}",
+            SQLALCHEMY_REPLICA_URIS=[f"sqlite:///{tmp_path / 'replica.db'}"],
+            REPLICA_PIN_REDIS_URL=None,
+            CACHE_TYPE=cache_type,
+        )
+        # the replica never catches up, so anything read from it is visibly stale
+        db.metadata.create_all(db.engines["replica_0"])
+        return app
+
+    yield replica_app
+    # init_app registers a MetaData per bind on the shared db object;
+    # left behind, the next app's create_all() looks for replica_0
+    for key in replicas.keys:
+        db.metadatas.pop(key, None)
+
+@pytest.fixture
+def replica_app(replica_apps):
+    return replica_apps("null")
+
+@pytest.fixture
+def cached_replica_app(replica_apps):
+    return replica_apps("memory")
+
+
+def test_get_requests_read_from_the_replica(replica_app):
+    with db.engines["replica_0"].begin() as conn:
+        conn.execute(db.insert(Post), {"title": "Only on replica", "content": "x", "author_id": 1})
+
+    res = replica_app.test_client().get("/posts")
+
+    assert [p["title"] for p in res.json["data"]["items"]] == ["Only on replica"]
+    assert Post.query.count() == 0
+
+def test_writer_reads_primary_until_pin_expires(replica_app, login):
+    client = replica_app.test_client()
+    headers = login(client)
+
+    post_id = client.post("/posts", headers=headers, json={"title": "New", "content": "C"}).json["data"]["id"]
+
+    # the author sees the write straight away, others read the lagging replica
+    assert client.get(f"/posts/{post_id}", headers=headers).status_code == 200
+    assert client.get(f"/posts/{post_id}").status_code == 404
+
+    user_id = User.query.filter_by(username="testuser").one().id
+    replicas.pins.delete(f"user:{user_id}")
+    assert client.get(f"/posts/{post_id}", headers=headers).status_code == 404
+
+def test_cached_listing_keeps_read_your_writes(cached_replica_app, login, monkeypatch):
+    client = cached_replica_app.test_client()
+    headers = login(client)
+
+    client.post("/posts", headers=headers, json={"title": "New", "content": "C"})
+
+    # rendered from the lagging replica right after the write: not stored
+    anonymous = client.get("/posts")
+    assert anonymous.json["data"]["items"] == []
+    assert client.get("/posts").headers["X-Cache"] == "MISS"
+
+    # the pinned writer bypasses the cache and reads the primary
+    own = client.get("/posts", headers=headers)
+    assert own.headers["X-Cache"] == "BYPASS"
+    assert [p["title"] for p in own.json["data"]["items"]] == ["New"]
+
+    # once the lag window has passed, replica reads are cached again
+    monkeypatch.setattr(cache, "replica_lag", 0)
+    client.get("/posts")
+    assert client.get("/posts").headers["X-Cache"] == "HIT"
@@ -0,0 +1,65 @@
+from app.extensions import db
+from app.models import Counter, User
+
+
+def _create(client, headers, *titles):
+    for title in titles:
+        client.post("/posts", headers=headers, json={"title": title, "content": "x"})
+
+
+def test_unfiltered_totals_come_from_counters(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    _create(client, headers, "One", "Two", "Three")
+
+    data = client.get("/posts?per_page=2").json["data"]
+    assert (data["total"], data["pages"], data["total_exact"]) == (3, 2, True)
+    assert data["has_next"] is True
+
+    # served from the counter row (seeded by the migration), not a COUNT(*)
+    db.session.add(Counter(name="posts", value=7))
+    db.session.commit()
+    assert client.get("/posts?per_page=2&page=2").json["data"]["total"] == 7
+
+    pagination = client.get("/my-posts", headers=headers).json["data"]["pagination"]
+    assert (pagination["total"], pagination["total_exact"]) == (3, True)
+
+def test_filtered_totals_are_cached_and_flagged(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    _create(client, headers, "Flask one", "Other")
+
+    first = client.get("/posts?search=flask").json["data"]
+    assert (first["total"], first["total_exact"]) == (1, True)
+
+    _create(client, headers, "Flask two")
+
+    second = client.get("/posts?search=flask").json["data"]
+    assert len(second["items"]) == 2
+    assert (second["total"], second["total_exact"]) == (1, False)
+
+def test_deleting_posts_and_reconcile_keep_counters_right(app, client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    _create(client, headers, "One", "Two")
+    post_id = client.get("/posts").json["data"]["items"][0]["id"]
+
+    client.delete(f"/posts/{post_id}", headers=headers)
+    assert client.get("/posts").json["data"]["total"] == 1
+
+    db.session.execute(db.update(Counter).values(value=9))
+    db.session.execute(db.update(User).values(post_count=9))
+    db.session.commit()
+    app.test_cli_runner().invoke(args=["counters", "reconcile"])
+
+    assert client.get("/posts").json["data"]["total"] == 1
+    assert client.get("/my-posts", headers=headers).json["data"]["pagination"]["total"] == 1
+
+def test_listing_without_counter_row_does_not_reload_posts(app, client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    _create(client, headers, "One", "Two", "Three")
+    app.config["SERVER_TIMING_ENABLED"] = True
+
+    res = client.get("/posts")
+
+    assert res.json["data"]["total"] == 3
+    assert Counter.query.count() == 0
+    # page, counter lookup and fallback COUNT; no per-post reloads
+    assert '"3 queries"' in res.headers["Server-Timing"]
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models import Post
+from app.services.trending import trending
+
+
+def _posts(client, headers, count):
+    return [
+        client.post("/posts", headers=headers, json={"title": f"P{i}", "content": "x"}).json["data"]["id"]
+        for i in range(count)
+    ]
+
+def _trending(client, **params):
+    return client.get("/posts/trending", query_string=params).json["data"]
+
+
+def test_trending_ranks_engagement_and_follows_new_writes(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    first, second, third = _posts(client, headers, 3)
+
+    client.post(f"/posts/{second}/like", headers=headers)
+    client.post(f"/posts/{third}/comments", headers=headers, json={"text": "hi"})
+
+    # built from the counters on first use; posts without engagement are left out
+    assert [p["id"] for p in _trending(client)["items"]] == [third, second]
+
+    # later writes only bump the stored score
+    for _ in range(2):
+        client.post(f"/posts/{first}/comments", headers=headers, json={"text": "hi"})
+    client.delete(f"/posts/{second}/like", headers=headers)
+
+    assert [p["id"] for p in _trending(client)["items"]] == [first, third]
+
+def test_trending_cursor_pages(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    post_ids = _posts(client, headers, 3)
+    for post_id in post_ids:
+        client.post(f"/posts/{post_id}/like", headers=headers)
+
+    seen, cursor = [], ""
+    while True:
+        page = _trending(client, per_page=1, cursor=cursor)
+        seen += [p["id"] for p in page["items"]]
+        if not page["has_next"]:
+            break
+        cursor = page["next_cursor"]
+
+    # equal engagement: newer posts rank higher
+    assert seen == list(reversed(post_ids))
+    assert client.get("/posts/trending?cursor=bogus").status_code == 400
+
+def test_trending_decays_with_age(client, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    old, new = _posts(client, headers, 2)
+    client.post(f"/posts/{old}/comments", headers=headers, json={"text": "hi"})
+    client.post(f"/posts/{new}/like", headers=headers)
+
+    # two half-lives ago: the comment's 2 points count a quarter
+    db.session.execute(
+        db.update(Post).where(Post.id == old).values(created_at=datetime.utcnow() - timedelta(hours=24))
+    )
+    db.session.commit()
+    trending.rebase()
+
+    items = _trending(client)["items"]
+    assert [p["id"] for p in items] == [new, old]
+    assert round(items[0]["score"], 2) == 1.0
+    assert round(items[1]["score"], 2) == 0.5